@@ -0,0 +1,580 @@
+"""
+바코드 리더 시스템 asyncio 실행 파일
+
+리더, 바코드 전송, 상태 모니터, 헬스 로그 전송을 하나의 이벤트 루프에서 실행합니다.
+시리얼 포트는 이벤트 루프의 읽기 준비(readiness) 알림으로 읽고,
+HTTP 요청은 비동기 소켓으로 보내므로 리더/전송 건수가 늘어도 스레드가 늘지 않습니다.
+모든 대기 시간은 이벤트 루프 시각 기준 마감 시각(deadline)으로 표현합니다.
+
+사용 예:
+    python async_main.py
+    SERIAL_PORTS=/dev/ttyUSB0,/dev/ttyUSB1 python async_main.py
+"""
+
+import asyncio
+import json
+import os
+import signal
+import ssl
+import uuid
+from collections import namedtuple
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+import serial
+
+from config import (
+    SERIAL_PORTS, BAUD_RATE, DID_SERVERS, CHECK_INTERVAL, ENABLE_ERROR_LOG_UPLOAD,
+    SEND_QUEUE_SIZE, SEND_QUEUE_HIGH_WATER, ORDER_CONCURRENCY, HEALTH_CONCURRENCY, DIAGNOSTIC_CONCURRENCY,
+    HEALTH_LOG_TTL, SERVER_CHECK_WAIT, ENABLE_HEDGING, SERIAL_CAPTURE_FILE,
+    ENABLE_STATUS_API, STATUS_API_HOST, STATUS_API_PORT
+)
+from barcode_reader import (
+    ReaderState, reader_state, new_flood_guard, handle_barcode_line,
+    check_barcode_reader_activity, initialize_barcode_reader_times
+)
+from endpoints import endpoint_pool
+from server_client import (
+    record_send_response, record_send_error, record_server_status, record_endpoint_failure, get_server_status
+)
+from logging_client import get_logger, log_info, log_error, log_success, log_debug, show_warning_message
+from monitor import setup_logger, log_status
+from profiler import install_signal_handlers
+from serial_trace import open_capture
+from status_api import StatusCache, collect_status, build_response, REQUEST_TIMEOUT, STATUS_PATH
+
+
+HttpResponse = namedtuple('HttpResponse', ['status_code', 'text'])
+
+RECONNECT_DELAY = 5     # 시리얼 포트 재연결 대기 (초)
+LINE_IDLE_TIMEOUT = 1   # 종단 문자 없이 이 시간 동안 입력이 없으면 한 줄로 처리 (readline timeout과 동일)
+SHUTDOWN_GRACE = 5      # 종료 시 남은 바코드 전송 대기 시간 (초)
+SEND_TIMEOUT = 10       # 엔드포인트별 바코드 전송 제한 시간 (초, 스레드 모드의 requests timeout과 동일)
+
+
+def deadline_after(seconds):
+    """
+    현재 이벤트 루프 시각 기준 마감 시각을 반환합니다.
+    """
+    return asyncio.get_running_loop().time() + seconds
+
+
+def remaining(deadline):
+    """
+    마감 시각까지 남은 시간(초)을 반환합니다. 지났으면 0.
+    """
+    return max(0.0, deadline - asyncio.get_running_loop().time())
+
+
+async def sleep_unless_stopped(stop, seconds):
+    """
+    지정 시간 동안 대기하되 종료 요청이 오면 즉시 돌아옵니다.
+
+    Returns:
+        bool: 종료 요청 여부
+    """
+    try:
+        await asyncio.wait_for(stop.wait(), seconds)
+    except asyncio.TimeoutError:
+        pass
+    return stop.is_set()
+
+
+async def _read_chunked(reader):
+    chunks = []
+    while True:
+        size = int((await reader.readline()).split(b';')[0], 16)
+        if size == 0:
+            await reader.readline()
+            return b''.join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readline()
+
+
+async def http_request(method, url, payload=None, deadline=None, headers=None):
+    """
+    최소한의 비동기 HTTP/1.1 요청을 보냅니다. (Connection: close)
+
+    Args:
+        method (str): HTTP 메서드
+        url (str): 요청 URL (http / https)
+        payload (dict): JSON 본문 (선택)
+        deadline (float): 마감 시각 (이벤트 루프 시각, 기본: 10초 후)
+        headers (dict): 추가 요청 헤더 (선택)
+
+    Returns:
+        HttpResponse: 상태 코드와 본문
+    """
+    parts = urlsplit(url)
+    secure = parts.scheme == 'https'
+    port = parts.port or (443 if secure else 80)
+    path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+
+    lines = [f'{method} {path} HTTP/1.1', f'Host: {parts.netloc}', 'Connection: close',
+             'User-Agent: did-order-announcer']
+    if payload is not None:
+        lines += ['Content-Type: application/json', f'Content-Length: {len(body)}']
+    lines += [f'{name}: {value}' for name, value in (headers or {}).items()]
+    request = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+    async def exchange():
+        reader, writer = await asyncio.open_connection(
+            parts.hostname, port, ssl=ssl.create_default_context() if secure else None
+        )
+        try:
+            writer.write(request)
+            await writer.drain()
+
+            status_code = int((await reader.readline()).split()[1])
+            length = None
+            chunked = False
+            while True:
+                header = await reader.readline()
+                if header in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = header.decode('latin-1').partition(':')
+                name = name.strip().lower()
+                if name == 'content-length':
+                    length = int(value)
+                elif name == 'transfer-encoding' and 'chunked' in value.lower():
+                    chunked = True
+
+            if chunked:
+                content = await _read_chunked(reader)
+            elif length is not None:
+                content = await reader.readexactly(length)
+            else:
+                content = await reader.read()
+            return HttpResponse(status_code, content.decode('utf-8', 'replace'))
+        finally:
+            writer.close()
+
+    if deadline is None:
+        deadline = deadline_after(10)
+    return await asyncio.wait_for(exchange(), remaining(deadline))
+
+
+async def _post_to_endpoint(endpoint, payload, headers, deadline):
+    """
+    엔드포인트 하나에 바코드를 전송하고 결과를 엔드포인트 상태에 기록합니다.
+    5xx 응답과 연결 오류는 실패로 기록합니다.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    try:
+        response = await http_request('POST', endpoint.api_url, payload, deadline, headers)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        record_endpoint_failure(endpoint)
+        raise
+    if response.status_code >= 500:
+        record_endpoint_failure(endpoint)
+    else:
+        endpoint_pool.record_success(endpoint, loop.time() - started)
+    return response
+
+
+def _consume_result(task):
+    # 응답을 기다리지 않는 hedged 요청의 예외가 경고로 남지 않도록 소비
+    if not task.cancelled():
+        task.exception()
+
+
+async def post_with_failover(payload, headers, timeout=None):
+    """
+    엔드포인트 우선순위대로 전송을 시도합니다. ENABLE_HEDGING이면 응답이 hedge_delay보다
+    늦을 때 다음 엔드포인트로도 같은 요청을 보내고 먼저 온 정상 응답을 사용합니다.
+    시도마다 따로 마감 시각을 두므로 응답 없는 서버가 다음 서버의 전송 시간을 쓰지 않습니다.
+    
+    Args:
+        payload (dict): 전송할 JSON 본문
+        headers (dict): 요청 헤더 (모든 시도가 같은 Idempotency-Key 공유)
+        timeout (float): 시도별 제한 시간 (초, 기본: SEND_TIMEOUT)
+    
+    Returns:
+        HttpResponse: 처음 받은 정상(5xx 아님) 응답, 없으면 마지막 응답
+    """
+    if timeout is None:
+        timeout = SEND_TIMEOUT
+    candidates = endpoint_pool.ordered()
+    pending = set()
+    last_response = None
+    last_error = None
+
+    def launch():
+        target = candidates.pop(0)
+        task = asyncio.ensure_future(_post_to_endpoint(target, payload, headers, deadline_after(timeout)))
+        task.add_done_callback(_consume_result)
+        pending.add(task)
+        return target
+
+    endpoint = launch()
+    while pending:
+        hedge_delay = endpoint_pool.hedge_delay(endpoint) if ENABLE_HEDGING and candidates else None
+        done, pending = await asyncio.wait(pending, timeout=hedge_delay, return_when=asyncio.FIRST_COMPLETED)
+        if not done:
+            endpoint = launch()
+            log_debug(f"응답 지연 - {endpoint.base_url}로 hedged 요청 전송")
+            continue
+        for task in done:
+            if task.exception() is not None:
+                last_error = task.exception()
+                continue
+            last_response = task.result()
+            if last_response.status_code < 500:
+                return last_response
+        if not pending and candidates:
+            endpoint = launch()
+    if last_response is not None:
+        return last_response
+    raise last_error
+
+
+class AsyncOutbound:
+    """
+    이벤트 루프용 전송 관리자.
+    바코드는 순서대로 전송하고, 헬스 로그와 서버 점검은 바코드 대기열이 빌 때까지 보류합니다.
+    """
+
+    def __init__(self, queue_size=SEND_QUEUE_SIZE, high_water=SEND_QUEUE_HIGH_WATER):
+        """
+        Args:
+            queue_size (int): 바코드 전송 대기열 최대 건수 (가득 차면 리더가 대기)
+            high_water (int): 이 건수 이상이면 리더 읽기 지연
+        """
+        self.orders = asyncio.Queue(queue_size)
+        self.high_water = high_water
+        self.active = 0
+        self.changed = asyncio.Condition()
+        self.health_slots = asyncio.Semaphore(HEALTH_CONCURRENCY)
+        self.diagnostic_slots = asyncio.Semaphore(DIAGNOSTIC_CONCURRENCY)
+        self.tasks = set()
+
+    def spawn(self, coro):
+        """종료 시 함께 취소할 백그라운드 작업을 시작합니다."""
+        task = asyncio.ensure_future(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    async def submit_order(self, barcode):
+        """바코드를 전송 대기열에 넣습니다. 대기열이 가득 차 있으면 빈 자리가 날 때까지 대기합니다."""
+        await self.orders.put(barcode)
+
+    def saturated(self):
+        """바코드 전송 대기열 포화 여부"""
+        return self.orders.qsize() >= self.high_water
+
+    def pending(self):
+        """전송 대기 또는 진행 중인 바코드 수"""
+        return self.orders.qsize() + self.active
+
+    async def _notify(self):
+        async with self.changed:
+            self.changed.notify_all()
+
+    async def wait_for(self, predicate, deadline=None):
+        """
+        전송 상태가 바뀔 때마다 predicate를 확인하며 참이 될 때까지 대기합니다.
+
+        Returns:
+            bool: predicate 결과 (마감 시각 초과 시 False)
+        """
+        async with self.changed:
+            if deadline is None:
+                return await self.changed.wait_for(predicate)
+            try:
+                return await asyncio.wait_for(self.changed.wait_for(predicate), remaining(deadline))
+            except asyncio.TimeoutError:
+                return predicate()
+
+    async def run_order_worker(self):
+        """바코드 전송 작업 (ORDER_CONCURRENCY개 실행)"""
+        while True:
+            barcode = await self.orders.get()
+            self.active += 1
+            try:
+                response = await post_with_failover({'id': barcode}, {'Idempotency-Key': uuid.uuid4().hex})
+                record_send_response(barcode, response.status_code, response.text)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                record_send_error(barcode, e)
+            finally:
+                self.active -= 1
+                self.orders.task_done()
+                await self._notify()
+
+    async def probe_server(self):
+        """
+        서버 연결을 점검합니다. 바코드 전송이 밀려 SERVER_CHECK_WAIT 안에 대기열이 비지 않으면
+        점검을 건너뛰고 직전 상태를 반환합니다.
+
+        Returns:
+            bool: 서버 연결 상태
+        """
+        if not await self.wait_for(lambda: self.orders.qsize() == 0, deadline_after(SERVER_CHECK_WAIT)):
+            log_debug("서버 점검이 바코드 전송에 밀려 보류됨 - 직전 상태 유지")
+            return get_server_status()
+        async with self.diagnostic_slots:
+            available = False
+            for endpoint in endpoint_pool.ordered():
+                started = asyncio.get_running_loop().time()
+                try:
+                    await http_request('GET', endpoint.base_url, deadline=deadline_after(5))
+                    endpoint_pool.record_success(endpoint, asyncio.get_running_loop().time() - started)
+                    available = True
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    record_endpoint_failure(endpoint)
+            return record_server_status(available)
+
+    async def ship_health_log(self, logger, health_data, errors):
+        """
+        헬스 에러 로그를 전송합니다. 바코드 대기열이 빌 때까지 보류하며 HEALTH_LOG_TTL이 지나면 버립니다.
+        """
+        deadline = deadline_after(HEALTH_LOG_TTL)
+        if not await self.wait_for(lambda: self.orders.qsize() == 0, deadline):
+            log_debug("유효 시간이 지난 health 요청을 버렸습니다.")
+            return
+        async with self.health_slots:
+            try:
+                response = await http_request('POST', endpoint_pool.ordered()[0].health_log_url,
+                                              logger.build_health_payload(health_data, errors), deadline_after(10))
+                logger.record_health_log_response(errors, response.status_code)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.log_error("로그 전송", f"헬스 에러 로그 서버 전송 오류: {e}")
+
+
+async def _read_lines(connection, state, guard, outbound):
+    """
+    열린 시리얼 포트에서 읽기 준비 알림을 받아 한 줄씩 처리합니다.
+    전송 대기열이 포화되면 읽기 알림을 해제해 데이터를 OS 버퍼에 남겨둡니다.
+    """
+    loop = asyncio.get_running_loop()
+    fd = connection.fileno()
+    readable = asyncio.Event()
+    buffer = bytearray()
+    loop.add_reader(fd, readable.set)
+
+    async def process(line):
+        # handle_barcode_line의 send는 동기 함수이므로 모았다가 대기열에 넣음 (가득 차면 대기)
+        barcodes = []
+        handle_barcode_line(line.decode('utf-8', 'replace').strip(), state, guard, barcodes.append)
+        for barcode in barcodes:
+            await outbound.submit_order(barcode)
+
+    try:
+        while True:
+            if outbound.saturated():
+                loop.remove_reader(fd)
+                show_warning_message("전송 대기열 포화", "서버 전송이 밀려 바코드 읽기를 일시 지연합니다.")
+                await outbound.wait_for(lambda: not outbound.saturated())
+                log_info("전송 대기열 여유 확보 - 바코드 읽기 재개")
+                loop.add_reader(fd, readable.set)
+
+            try:
+                await asyncio.wait_for(readable.wait(), LINE_IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                # 종단 문자 없이 끝난 입력은 readline timeout처럼 한 줄로 처리
+                line, buffer = bytes(buffer), bytearray()
+                await process(line)
+                continue
+            readable.clear()
+
+            # 준비 알림 후 데이터가 없으면 pyserial이 SerialException(장치 분리)을 발생시킴
+            buffer += connection.read(connection.in_waiting or 1)
+            while b'\n' in buffer:
+                line, _, rest = bytes(buffer).partition(b'\n')
+                buffer = bytearray(rest)
+                await process(line)
+    finally:
+        loop.remove_reader(fd)
+
+
+async def run_reader(port, state, outbound, stop):
+    """
+    시리얼 포트 하나를 열고 읽으며, 끊어지면 재연결합니다.
+
+    Args:
+        port (str): 시리얼 포트 이름
+        state (ReaderState): 이 리더의 상태
+        outbound (AsyncOutbound): 전송 관리자
+        stop (asyncio.Event): 종료 요청
+    """
+    guard = new_flood_guard(state)
+    while not stop.is_set():
+        try:
+            connection = serial.Serial(port, BAUD_RATE, timeout=0)
+            if SERIAL_CAPTURE_FILE:
+                # 리더가 여럿이면 포트별 파일로 분리 (logs/scanner.trace → logs/scanner._dev_ttyUSB0.trace)
+                path = SERIAL_CAPTURE_FILE
+                if len(SERIAL_PORTS) > 1:
+                    root, ext = os.path.splitext(SERIAL_CAPTURE_FILE)
+                    path = f"{root}.{port.replace('/', '_')}{ext}"
+                connection = open_capture(connection, path, port, BAUD_RATE)
+        except serial.SerialException as e:
+            state.update(serial_port_available=False, serial_connection=None)
+            log_error("시리얼 포트", f"{port}을(를) 열 수 없습니다: {e}")
+            await sleep_unless_stopped(stop, RECONNECT_DELAY)
+            continue
+
+        state.update(serial_port_available=True, serial_connection=connection)
+        log_success(f"시리얼 포트 {port}을(를) {BAUD_RATE} 보드레이트로 열었습니다.")
+        try:
+            await _read_lines(connection, state, guard, outbound)
+        except serial.SerialException as e:
+            log_error("시리얼 포트", f"{port} 읽기 오류: {e}")
+        finally:
+            state.update(serial_port_available=False, serial_connection=None)
+            connection.close()
+        await sleep_unless_stopped(stop, RECONNECT_DELAY)
+
+
+async def run_monitor(states, outbound, stop):
+    """
+    CHECK_INTERVAL마다 시스템 상태를 확인하고 에러 시 헬스 로그를 전송합니다.
+    """
+    while not stop.is_set():
+        try:
+            server_status = await outbound.probe_server()
+            for state in states:
+                check_barcode_reader_activity(state)
+            snapshots = [state.snapshot() for state in states]
+            serial_status = all(snapshot.serial_port_available for snapshot in snapshots)
+            barcode_reader_status = all(snapshot.barcode_reader_active for snapshot in snapshots)
+            scan_flood = any([state.take_scan_flood_alarm() for state in states])
+
+            log_status(serial_status, server_status, barcode_reader_status, scan_flood)
+
+            if ENABLE_ERROR_LOG_UPLOAD:
+                logger = get_logger()
+                health_data, errors = logger.log_system_health(
+                    serial_status, server_status, barcode_reader_status, scan_flood, upload=False
+                )
+                if errors:
+                    outbound.spawn(outbound.ship_health_log(logger, health_data, errors))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log_error("모니터링", f"상태 모니터링 오류: {e}")
+        await sleep_unless_stopped(stop, CHECK_INTERVAL)
+
+
+async def handle_status_request(reader, writer, cache):
+    """
+    상태 API 요청 하나를 처리합니다. (응답 후 연결 종료)
+    """
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+        if_none_match = None
+        while True:
+            line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'if-none-match':
+                if_none_match = value.strip()
+
+        parts = request_line.decode('latin-1').split()
+        if len(parts) < 2:
+            return
+        code, headers, body = build_response(cache, parts[0], parts[1], if_none_match)
+        reason = HTTPStatus(code).phrase
+        head = f'HTTP/1.1 {code} {reason}\r\nConnection: close\r\n'
+        head += ''.join(f'{name}: {value}\r\n' for name, value in headers) + '\r\n'
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_status_server(states, outbound):
+    """
+    상태 API 서버를 이벤트 루프에서 시작합니다. (스레드 추가 없음)
+
+    Returns:
+        asyncio.AbstractServer or None: 서버 객체 (시작 실패 시 None)
+    """
+    cache = StatusCache(lambda: collect_status(states, outbound.pending))
+    try:
+        server = await asyncio.start_server(
+            lambda reader, writer: handle_status_request(reader, writer, cache), STATUS_API_HOST, STATUS_API_PORT
+        )
+    except OSError as e:
+        log_error("상태 API", f"{STATUS_API_HOST}:{STATUS_API_PORT} 열기 실패: {e}")
+        return None
+    log_info(f"상태 API 시작됨: http://{STATUS_API_HOST}:{STATUS_API_PORT}{STATUS_PATH}")
+    return server
+
+
+async def run(ports=SERIAL_PORTS):
+    """
+    이벤트 루프에서 전체 파이프라인을 실행하고 SIGINT/SIGTERM에 정상 종료합니다.
+
+    Args:
+        ports (list): 시리얼 포트 목록
+    """
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows 등: KeyboardInterrupt로 종료
+
+    outbound = AsyncOutbound()
+    # 첫 번째 리더는 기본 reader_state를 사용해 get_*_status()와 호환
+    states = [reader_state] + [ReaderState() for _ in ports[1:]]
+    for state in states:
+        initialize_barcode_reader_times(state)
+
+    workers = [outbound.spawn(outbound.run_order_worker()) for _ in range(ORDER_CONCURRENCY)]
+    readers = [outbound.spawn(run_reader(port, state, outbound, stop)) for port, state in zip(ports, states)]
+    monitor = outbound.spawn(run_monitor(states, outbound, stop))
+    status_server = await start_status_server(states, outbound) if ENABLE_STATUS_API else None
+    log_info(f"asyncio 모드 시작: 리더 {len(readers)}개 ({', '.join(ports)})")
+
+    try:
+        await stop.wait()
+    finally:
+        log_info("종료 요청 - 리더와 모니터를 정리합니다.")
+        if status_server is not None:
+            status_server.close()
+        for task in readers + [monitor]:
+            task.cancel()
+        await asyncio.gather(*readers, monitor, return_exceptions=True)
+
+        # 이미 읽은 바코드는 잠시 기다려 전송 마무리
+        if not await outbound.wait_for(lambda: outbound.pending() == 0, deadline_after(SHUTDOWN_GRACE)):
+            log_error("종료", f"전송하지 못한 바코드 {outbound.pending()}건")
+        remaining_tasks = list(outbound.tasks)
+        for task in remaining_tasks:
+            task.cancel()
+        await asyncio.gather(*remaining_tasks, return_exceptions=True)
+
+
+def main():
+    """
+    asyncio 모드 메인 실행 함수
+    """
+    setup_logger()
+    log_info("바코드 리더 시스템을 asyncio 모드로 시작합니다.")
+    log_info(f"서버 주소: {', '.join(DID_SERVERS)}")
+    install_signal_handlers()
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    log_info("프로그램을 종료합니다.")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,65 +3,164 @@
 """
 
 import serial
+import threading
 import time
-from datetime import datetime, timedelta
+from collections import namedtuple
+from datetime import datetime
 
 from config import (
     SERIAL_PORT, BAUD_RATE, WARNING_INTERVAL, 
-    HEALTH_CHECK_INTERVAL, BARCODE_ACTIVITY_TIMEOUT
+    HEALTH_CHECK_INTERVAL, BARCODE_ACTIVITY_TIMEOUT,
+    SCAN_RATE_LIMIT, SCAN_RATE_BURST, FLOOD_SUMMARY_INTERVAL
 )
 from logging_client import show_warning_message, log_info, log_error, log_success, log_debug
-from server_client import send_to_server
+from rate_limiter import FloodGuard
+from server_client import enqueue_barcode, is_send_queue_saturated, wait_for_send_capacity
 
 
-# 상태 변수들
-serial_port_available = False
-barcode_reader_active = False
-serial_connection = None
-last_barcode_time = None
-last_sent_barcode = None
-last_serial_warning = None
-last_barcode_warning = None
+# 리더 상태 스냅샷 (불변 - 교체 방식으로만 갱신)
+ReaderSnapshot = namedtuple('ReaderSnapshot', [
+    'serial_port_available',    # 시리얼 포트 연결 가능 여부
+    'barcode_reader_active',    # 바코드 리더 활성 여부
+    'serial_connection',        # 열려 있는 시리얼 연결 객체
+    'last_barcode_time',        # 마지막 바코드 수신 시각 (monotonic, 초)
+    'last_barcode_at',          # 마지막 바코드 실제 수신 시각 (표시용 datetime, 수신 전에는 None)
+    'last_sent_barcode',        # 마지막으로 전송한 바코드
+    'last_serial_warning',      # 마지막 시리얼 경고 시각 (monotonic, 초)
+    'last_barcode_warning',     # 마지막 바코드 리더 경고 시각 (monotonic, 초)
+    'scan_flood',               # 스캔 폭주 감지 여부 (현재 상태)
+    'scan_flood_alarm',         # 스캔 폭주 헬스 알람 (폭주 시작 시 설정, 상태 체크가 보고할 때까지 유지)
+])
 
 
-def check_serial_port():
+class ReaderState:
+    """
+    바코드 리더 한 대의 상태.
+    
+    쓰기는 락으로 직렬화하고 매번 새 ReaderSnapshot으로 교체하므로,
+    상태 모니터 등 다른 스레드는 락 없이 snapshot()으로 일관된 값을 읽을 수 있습니다.
+    시간 값은 NTP 보정 등에 영향받지 않도록 monotonic 시계를 사용합니다.
+    """
+    
+    __slots__ = ('_lock', '_snapshot', 'clock')
+    
+    def __init__(self, clock=time.monotonic):
+        """
+        Args:
+            clock (callable): monotonic 시계 함수 (테스트 시 교체 가능)
+        """
+        self._lock = threading.Lock()
+        self._snapshot = ReaderSnapshot(False, False, None, None, None, None, None, None, False, False)
+        self.clock = clock
+    
+    def snapshot(self):
+        """
+        현재 상태 스냅샷을 반환합니다. (락 없음)
+        
+        Returns:
+            ReaderSnapshot: 상태 스냅샷
+        """
+        return self._snapshot
+    
+    def update(self, **changes):
+        """
+        상태 필드를 갱신합니다.
+        
+        Returns:
+            ReaderSnapshot: 갱신된 스냅샷
+        """
+        with self._lock:
+            self._snapshot = self._snapshot._replace(**changes)
+            return self._snapshot
+    
+    def mark_barcode_received(self):
+        """바코드 수신 시각을 기록하고 리더를 활성 상태로 표시합니다."""
+        return self.update(last_barcode_time=self.clock(), last_barcode_at=datetime.now(),
+                           barcode_reader_active=True)
+    
+    def take_scan_flood_alarm(self):
+        """
+        상태 체크에서 보고할 스캔 폭주 알람을 가져오고 보고 완료로 표시합니다.
+        폭주가 상태 체크 주기보다 짧게 끝났더라도 다음 상태 체크에서 한 번은 보고됩니다.
+        
+        Returns:
+            bool: 현재 폭주 중이거나 직전 보고 이후 폭주가 있었으면 True
+        """
+        with self._lock:
+            alarm = self._snapshot.scan_flood or self._snapshot.scan_flood_alarm
+            self._snapshot = self._snapshot._replace(scan_flood_alarm=False)
+            return alarm
+    
+    def seconds_since_last_barcode(self):
+        """
+        마지막 바코드 수신 후 경과 시간을 반환합니다.
+        
+        Returns:
+            float or None: 경과 시간(초), 수신 기록이 없으면 None
+        """
+        last = self._snapshot.last_barcode_time
+        return None if last is None else self.clock() - last
+    
+    def warning_due(self, field):
+        """
+        경고 필드(last_serial_warning / last_barcode_warning) 기준으로
+        WARNING_INTERVAL이 지났으면 시각을 갱신하고 True를 반환합니다.
+        """
+        with self._lock:
+            now = self.clock()
+            last = getattr(self._snapshot, field)
+            if last is not None and now - last < WARNING_INTERVAL:
+                return False
+            self._snapshot = self._snapshot._replace(**{field: now})
+            return True
+
+
+# 기본 리더 상태
+reader_state = ReaderState()
+
+
+def check_serial_port(state=None):
     """
     시리얼 포트 연결 상태를 확인합니다.
     
+    Args:
+        state (ReaderState): 리더 상태 (기본: reader_state)
+    
     Returns:
         bool: 시리얼 포트 연결 가능 여부
     """
-    global serial_port_available, last_serial_warning
+    state = state or reader_state
     
     try:
         test_serial = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
         test_serial.close()
-        serial_port_available = True
+        state.update(serial_port_available=True)
         return True
     except serial.SerialException:
-        serial_port_available = False
-        current_time = datetime.now()
+        state.update(serial_port_available=False)
         
         # 5분마다 또는 처음 실행시에만 경고 메시지 표시
-        if (last_serial_warning is None or 
-            current_time - last_serial_warning >= timedelta(seconds=WARNING_INTERVAL)):
+        if state.warning_due('last_serial_warning'):
             show_warning_message(
                 "시리얼 포트 연결 오류",
                 f"시리얼 포트 {SERIAL_PORT}에 연결할 수 없습니다.\n바코드 리더가 제대로 연결되어 있는지 확인해주세요."
             )
-            last_serial_warning = current_time
         
         return False
 
 
-def check_barcode_reader_connection():
+def check_barcode_reader_connection(state=None):
     """
     바코드 리더 연결 상태를 간단히 확인합니다.
     시리얼 포트 연결 여부로만 판단합니다.
     
+    Args:
+        state (ReaderState): 리더 상태 (기본: reader_state)
+    
     Returns:
         bool: 연결 상태
     """
+    serial_connection = (state or reader_state).snapshot().serial_connection
     try:
         if serial_connection and serial_connection.is_open:
             log_debug("바코드 리더 시리얼 포트 연결 확인됨")
@@ -74,115 +173,202 @@ def check_barcode_reader_connection():
         return False
 
 
-def check_barcode_reader_activity():
+def check_barcode_reader_activity(state=None):
     """
     바코드 리더 활동 상태를 확인합니다. (Linux 환경 최적화)
     시리얼 포트 연결 + 최근 바코드 수신 여부로 판단합니다.
-    """
-    global barcode_reader_active, last_barcode_warning, last_barcode_time
     
-    current_time = datetime.now()
+    Args:
+        state (ReaderState): 리더 상태 (기본: reader_state)
+    """
+    state = state or reader_state
     
     # 1. 시리얼 포트 연결 상태 확인
-    connection_ok = check_barcode_reader_connection()
+    connection_ok = check_barcode_reader_connection(state)
     
     if connection_ok:
+        # 연결만으로도 일단 활성으로 간주
+        state.update(barcode_reader_active=True)
+        
         # 2. 최근 바코드 활동 확인
-        if last_barcode_time and current_time - last_barcode_time < timedelta(seconds=BARCODE_ACTIVITY_TIMEOUT):
-            barcode_reader_active = True
-            log_debug(f"바코드 리더 활성: 최근 바코드 수신 ({(current_time - last_barcode_time).seconds}초 전)")
-        else:
+        elapsed = state.seconds_since_last_barcode()
+        if elapsed is not None and elapsed < BARCODE_ACTIVITY_TIMEOUT:
+            log_debug(f"바코드 리더 활성: 최근 바코드 수신 ({elapsed:.0f}초 전)")
+        elif elapsed is not None:
             # 연결은 되어 있지만 바코드 수신이 없는 상태
-            barcode_reader_active = True  # 연결만으로도 일단 활성으로 간주
-            if last_barcode_time:
-                inactive_duration = (current_time - last_barcode_time).seconds
-                log_debug(f"바코드 리더 연결됨: 마지막 바코드 수신 {inactive_duration}초 전")
-            else:
-                log_debug("바코드 리더 연결됨: 바코드 수신 기록 없음")
+            log_debug(f"바코드 리더 연결됨: 마지막 바코드 수신 {elapsed:.0f}초 전")
+        else:
+            log_debug("바코드 리더 연결됨: 바코드 수신 기록 없음")
     else:
         # 시리얼 포트 연결 실패
-        barcode_reader_active = False
+        state.update(barcode_reader_active=False)
         
         # 5분마다 또는 처음 실행시에만 경고 메시지 표시
-        if (last_barcode_warning is None or 
-            current_time - last_barcode_warning >= timedelta(seconds=WARNING_INTERVAL)):
+        if state.warning_due('last_barcode_warning'):
             show_warning_message(
                 "바코드 리더 연결 오류",
                 "바코드 리더기와의 시리얼 포트 연결이 끊어졌습니다.\n리더기 연결 상태를 확인해주세요."
             )
-            last_barcode_warning = current_time
 
 
-def read_barcode(serial_conn):
+def _report_flood(state, guard):
+    """
+    스캔 폭주 요약을 기록하고 헬스 알람 상태를 갱신합니다.
+    
+    Args:
+        state (ReaderState): 리더 상태
+        guard (FloodGuard): 폭주 감지기
+    """
+    summary = guard.pop_summary()
+    if summary:
+        suppressed, seconds = summary
+        try:
+            from logging_client import get_logger
+            get_logger().log_barcode_flood(suppressed, seconds)
+        except Exception:
+            pass  # 로깅 실패는 무시
+    
+    if guard.flooding != state.snapshot().scan_flood:
+        if guard.flooding:
+            state.update(scan_flood=True, scan_flood_alarm=True)
+            show_warning_message(
+                "바코드 스캔 폭주",
+                f"초당 {SCAN_RATE_LIMIT:g}건(순간 {SCAN_RATE_BURST}건)을 넘는 스캔이 들어오고 있습니다.\n"
+                "트리거 고착 또는 연속 스캔 모드 여부를 확인해주세요."
+            )
+        else:
+            state.update(scan_flood=False)
+            log_info("바코드 스캔 폭주 해제")
+
+
+def new_flood_guard(state):
     """
-    시리얼 포트로부터 바코드 데이터를 읽어 서버로 전송합니다.
-    중복된 바코드는 전송하지 않습니다.
+    설정값으로 리더용 스캔 폭주 감지기를 만듭니다.
+    
+    Args:
+        state (ReaderState): 리더 상태 (시계 공유)
+    
+    Returns:
+        FloodGuard: 폭주 감지기
+    """
+    return FloodGuard(SCAN_RATE_LIMIT, SCAN_RATE_BURST, FLOOD_SUMMARY_INTERVAL, state.clock)
+
+
+def handle_barcode_line(line, state, guard, send):
+    """
+    시리얼 포트에서 읽은 한 줄을 처리합니다.
+    속도 제한과 중복 필터를 거친 바코드만 send로 넘깁니다.
+    
+    Args:
+        line (str): 디코딩된 한 줄 (앞뒤 공백 제거)
+        state (ReaderState): 리더 상태
+        guard (FloodGuard): 스캔 폭주 감지기
+        send (callable): 바코드 전송 함수 (barcode 인자 하나)
+    """
+    if line:
+        # 바코드 데이터를 받았으므로 시간 업데이트
+        state.mark_barcode_received()
+        
+        # 여러 바코드가 포함될 수 있으므로 분리
+        # \n 또는 공백을 기준으로 분리
+        # 속도 제한을 넘는 스캔은 로깅 없이 버림 (요약만 기록)
+        barcodes = [barcode for barcode in line.replace('\n', ' ').split() if guard.allow()]
+        if barcodes:
+            log_debug(f"시리얼 포트에서 데이터 수신: '{line}' (길이: {len(line)})")
+        
+        for barcode in barcodes:
+            last_sent_barcode = state.snapshot().last_sent_barcode
+            if barcode != last_sent_barcode:
+                log_info(f"받은 바코드: {barcode}")
+                log_debug(f"바코드 데이터 길이: {len(barcode)}, 내용: '{barcode}'")
+                
+                # 바코드 수신 이벤트 로깅
+                try:
+                    from logging_client import get_logger
+                    logger = get_logger()
+                    logger.log_barcode_received(barcode, is_duplicate=False)
+                except Exception:
+                    pass  # 로깅 실패는 무시
+                
+                send(barcode)
+                state.update(last_sent_barcode=barcode)
+            else:
+                log_info(f"중복된 바코드 {barcode}는 전송하지 않습니다.")
+                log_debug(f"중복 바코드 상세: 이전='{last_sent_barcode}', 현재='{barcode}'")
+                
+                # 중복 바코드 이벤트 로깅
+                try:
+                    from logging_client import get_logger
+                    logger = get_logger()
+                    logger.log_barcode_received(barcode, is_duplicate=True)
+                except Exception:
+                    pass  # 로깅 실패는 무시
+    
+    _report_flood(state, guard)
+
+
+def read_barcode(serial_conn, state=None, guard=None, send=None):
+    """
+    시리얼 포트로부터 바코드 데이터를 읽어 서버 전송 대기열에 넣습니다.
+    중복된 바코드는 전송하지 않으며, 속도 제한을 넘는 스캔은 버리고 요약만 기록합니다.
+    기본 전송 대기열을 쓸 때는 대기열이 포화되면 여유가 생길 때까지 읽기를 멈춥니다.
     
     Args:
         serial_conn: 시리얼 연결 객체
+        state (ReaderState): 리더 상태 (기본: reader_state)
+        guard (FloodGuard): 스캔 폭주 감지기 (기본: 설정값으로 생성)
+        send (callable): 바코드 전송 함수 (기본: enqueue_barcode).
+            지정하면 전송 대기열(스케줄러)을 확인하지 않으며, 대기가 필요하면 send가 직접 대기합니다.
     """
-    global last_sent_barcode, last_barcode_time, barcode_reader_active
+    state = state or reader_state
+    guard = guard or new_flood_guard(state)
+    throttle = send is None
+    send = send or enqueue_barcode
+    throttled = False
     
     while True:
         try:
+            # 전송 대기열이 포화되면 읽기 지연 (그동안 데이터는 스캐너/OS 버퍼에 보관)
+            if throttle and is_send_queue_saturated():
+                if not throttled:
+                    show_warning_message("전송 대기열 포화", "서버 전송이 밀려 바코드 읽기를 일시 지연합니다.")
+                    throttled = True
+                if not wait_for_send_capacity(1):
+                    continue
+            if throttled:
+                log_info("전송 대기열 여유 확보 - 바코드 읽기 재개")
+                throttled = False
+            
             # 시리얼 포트에서 한 줄 읽기
             line = serial_conn.readline().decode('utf-8').strip()
-            if line:
-                log_debug(f"시리얼 포트에서 데이터 수신: '{line}' (길이: {len(line)})")
-                
-                # 바코드 데이터를 받았으므로 시간 업데이트
-                last_barcode_time = datetime.now()
-                barcode_reader_active = True
-                
-                # 여러 바코드가 포함될 수 있으므로 분리
-                # \n 또는 공백을 기준으로 분리
-                barcodes = line.replace('\n', ' ').split()
-                for barcode in barcodes:
-                    if barcode != last_sent_barcode:
-                        log_info(f"받은 바코드: {barcode}")
-                        log_debug(f"바코드 데이터 길이: {len(barcode)}, 내용: '{barcode}'")
-                        
-                        # 바코드 수신 이벤트 로깅
-                        try:
-                            from logging_client import get_logger
-                            logger = get_logger()
-                            logger.log_barcode_received(barcode, is_duplicate=False)
-                        except Exception:
-                            pass  # 로깅 실패는 무시
-                        
-                        send_to_server(barcode)
-                        last_sent_barcode = barcode
-                    else:
-                        log_info(f"중복된 바코드 {barcode}는 전송하지 않습니다.")
-                        log_debug(f"중복 바코드 상세: 이전='{last_sent_barcode}', 현재='{barcode}'")
-                        
-                        # 중복 바코드 이벤트 로깅
-                        try:
-                            from logging_client import get_logger
-                            logger = get_logger()
-                            logger.log_barcode_received(barcode, is_duplicate=True)
-                        except Exception:
-                            pass  # 로깅 실패는 무시
+            handle_barcode_line(line, state, guard, send)
+        except serial.SerialException:
+            # 장치 분리 등 포트 자체의 오류는 호출측(main)에서 재연결하도록 전달
+            raise
         except Exception as e:
             log_error("시리얼 포트", f"읽기 오류: {e}")
             time.sleep(1)  # 오류 발생 시 잠시 대기
 
 
-def open_serial_connection():
+def open_serial_connection(state=None):
     """
     시리얼 연결을 열고 관리합니다.
     
+    Args:
+        state (ReaderState): 리더 상태 (기본: reader_state)
+    
     Returns:
         serial.Serial or None: 성공시 시리얼 객체, 실패시 None
     """
-    global serial_connection
+    state = state or reader_state
     
     try:
         serial_connection = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
+        state.update(serial_connection=serial_connection)
         log_success(f"시리얼 포트 {SERIAL_PORT}을(를) {BAUD_RATE} 보드레이트로 열었습니다.")
         return serial_connection
     except serial.SerialException as e:
-        serial_connection = None
+        state.update(serial_connection=None)
         log_error("시리얼 포트", f"{SERIAL_PORT}을(를) 열 수 없습니다: {e}")
         return None
 
@@ -194,7 +380,7 @@ def get_serial_status():
     Returns:
         bool: 시리얼 포트 연결 상태
     """
-    return serial_port_available
+    return reader_state.snapshot().serial_port_available
 
 
 def get_barcode_reader_status():
@@ -204,24 +390,51 @@ def get_barcode_reader_status():
     Returns:
         bool: 바코드 리더 활성 상태
     """
-    return barcode_reader_active
+    return reader_state.snapshot().barcode_reader_active
+
+
+def get_scan_flood_status():
+    """
+    스캔 폭주 알람 상태를 반환합니다. (알람을 해제하지 않음)
+    
+    Returns:
+        bool: 현재 폭주 중이거나 아직 보고되지 않은 폭주가 있으면 True
+    """
+    snapshot = reader_state.snapshot()
+    return snapshot.scan_flood or snapshot.scan_flood_alarm
 
 
-def set_serial_connection(connection):
+def take_scan_flood_alarm(state=None):
+    """
+    상태 체크용 스캔 폭주 알람을 가져오고 보고 완료로 표시합니다.
+    
+    Args:
+        state (ReaderState): 리더 상태 (기본: reader_state)
+    
+    Returns:
+        bool: 보고할 스캔 폭주 여부
+    """
+    return (state or reader_state).take_scan_flood_alarm()
+
+
+def set_serial_connection(connection, state=None):
     """
     시리얼 연결 객체를 설정합니다.
     
     Args:
         connection: 시리얼 연결 객체
+        state (ReaderState): 리더 상태 (기본: reader_state)
     """
-    global serial_connection
-    serial_connection = connection
+    (state or reader_state).update(serial_connection=connection)
 
 
-def initialize_barcode_reader_times():
+def initialize_barcode_reader_times(state=None):
     """
     바코드 리더 관련 시간 변수들을 초기화합니다.
+    
+    Args:
+        state (ReaderState): 리더 상태 (기본: reader_state)
     """
-    global last_barcode_time
-    current_time = datetime.now()
-    last_barcode_time = current_time 
\ No newline at end of file
+    state = state or reader_state
+    # 활동 판단은 시작 시각부터 계산하되, 표시용 수신 시각(last_barcode_at)은 실제 수신 때만 기록
+    state.update(last_barcode_time=state.clock())
@@ -8,15 +8,32 @@ from dotenv import load_dotenv
 # .env 파일 로드
 load_dotenv()
 
+APP_VERSION = '1.0.0'   # 프로그램 버전 (상태 API로 보고)
+
 # 시리얼 통신 설정
 SERIAL_PORT = os.getenv('SERIAL_PORT', 'COM9')      # 시리얼 포트 이름 (예: 'COM3' for Windows, '/dev/ttyUSB0' for Linux)
 BAUD_RATE = int(os.getenv('BAUD_RATE', '9600'))     # 보드레이트 설정
+# asyncio 모드에서 함께 읽을 시리얼 포트 목록 (쉼표 구분, 기본: SERIAL_PORT 하나)
+SERIAL_PORTS = [port.strip() for port in os.getenv('SERIAL_PORTS', SERIAL_PORT).split(',') if port.strip()]
+# 시리얼 원시 데이터 캡처 파일 (비어 있으면 캡처 안 함, 재생: python serial_trace.py replay <파일>)
+SERIAL_CAPTURE_FILE = os.getenv('SERIAL_CAPTURE_FILE', '')
 
 # 서버 설정
 DID_SERVER = os.getenv('DID_SERVER', 'http://192.168.219.110')
 DID_PORT = int(os.getenv('DID_PORT', '5173'))
-API_URL = f'{DID_SERVER}:{DID_PORT}/api/post'       # API 엔드포인트
-SERVER_HOST = f'{DID_SERVER}:{DID_PORT}'            # 서버 호스트 (핑 체크용)
+# 우선순위 순 DID 서버 목록 (쉼표 구분, 예: 'http://10.0.0.5:5173,http://10.0.0.6:5173')
+DID_SERVERS = [url.strip().rstrip('/') for url in os.getenv('DID_SERVERS', '').split(',') if url.strip()] \
+    or [f'{DID_SERVER}:{DID_PORT}']
+API_URL = f'{DID_SERVERS[0]}/api/post'              # API 엔드포인트 (기본 서버)
+SERVER_HOST = DID_SERVERS[0]                        # 서버 호스트 (핑 체크용, 기본 서버)
+
+# 서버 장애 전환 / hedged 요청
+ENABLE_HEDGING = os.getenv('ENABLE_HEDGING', 'False').lower() == 'true'  # 기본 서버 응답이 늦으면 다음 서버로 동시 전송
+HEDGE_PERCENTILE = 95       # 이 백분위 응답 시간이 지나도록 응답이 없으면 hedged 요청 전송
+HEDGE_MIN_DELAY = float(os.getenv('HEDGE_MIN_DELAY', '0.05'))   # hedged 요청 최소 대기 (초)
+HEDGE_MAX_DELAY = float(os.getenv('HEDGE_MAX_DELAY', '1.0'))    # hedged 요청 최대 대기 (초, 기록 없을 때 사용)
+ENDPOINT_FAILURE_THRESHOLD = 3  # 연속 실패 횟수 - 넘으면 해당 서버를 장애로 보고 뒤로 미룸
+ENDPOINT_RETRY_INTERVAL = 30    # 장애 서버 재시도 간격 (초)
 
 # 모니터링 설정
 CHECK_INTERVAL = 300        # 5분 (300초) - 상태 체크 주기
@@ -29,8 +46,40 @@ BSD_PORT = int(os.getenv('BSD_PORT', '514')) if os.getenv('BSD_PORT') else None
 SYSLOG_ADDRESS = (BSD_SERVER, BSD_PORT) if BSD_SERVER and BSD_PORT else None  # syslog 서버 주소
 ENABLE_ERROR_LOG_UPLOAD = os.getenv('ENABLE_ERROR_LOG_UPLOAD', 'True').lower() == 'true'  # 에러 로그 서버 전송 활성화
 LOG_DIRECTORY = os.getenv('LOG_DIRECTORY', 'logs')  # 로컬 로그 파일 저장 디렉토리
+# 로컬 로그 그룹 커밋 (모았다가 파일마다 한 번에 기록)
+LOG_FLUSH_INTERVAL = float(os.getenv('LOG_FLUSH_INTERVAL', '0.02'))    # 레코드를 모으는 최대 시간 (초)
+LOG_FLUSH_BYTES = int(os.getenv('LOG_FLUSH_BYTES', '65536'))           # 이 크기 이상 모이면 즉시 기록 (바이트)
+LOG_FSYNC = os.getenv('LOG_FSYNC', 'barcode').lower()                  # fsync 정책: never, batch, barcode (바코드 이벤트만)
+
+# 읽기 전용 로컬 상태 API (GET /status)
+ENABLE_STATUS_API = os.getenv('ENABLE_STATUS_API', 'False').lower() == 'true'  # 상태 API 활성화 (인증 없음 - 필요 시에만 켜기)
+STATUS_API_HOST = os.getenv('STATUS_API_HOST', '0.0.0.0')                     # 바인드 주소
+STATUS_API_PORT = int(os.getenv('STATUS_API_PORT', '8765'))                   # 포트
+
+# 진단 설정 (SIGUSR1: 스택 덤프, SIGUSR2: 샘플링 프로파일러)
+PROFILE_DURATION = int(os.getenv('PROFILE_DURATION', '30'))                    # 프로파일링 시간 (초)
+PROFILE_SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', '0.01'))  # 샘플링 간격 (초)
 
 # 바코드 리더 활성 상태 판단 기준 (Linux 환경 최적화)
 # - 시리얼 포트 연결 가능: 리더기 물리적 연결 확인
 # - 최근 바코드 수신: 실제 동작 확인
-BARCODE_ACTIVITY_TIMEOUT = 300  # 5분 (300초) - 바코드 수신이 없으면 비활성으로 간주 
\ No newline at end of file
+BARCODE_ACTIVITY_TIMEOUT = 300  # 5분 (300초) - 바코드 수신이 없으면 비활성으로 간주
+
+# 스캔 폭주 방지 (리더별 토큰 버킷)
+SCAN_RATE_LIMIT = float(os.getenv('SCAN_RATE_LIMIT', '5'))              # 초당 허용 스캔 수
+SCAN_RATE_BURST = int(os.getenv('SCAN_RATE_BURST', '20'))               # 순간 허용 스캔 수
+FLOOD_SUMMARY_INTERVAL = int(os.getenv('FLOOD_SUMMARY_INTERVAL', '10')) # 폭주 요약 보고 주기 (초)
+
+# 바코드 전송 대기열 (가득 차면 리더를 늦춤)
+SEND_QUEUE_SIZE = int(os.getenv('SEND_QUEUE_SIZE', '100'))              # 최대 대기 건수
+SEND_QUEUE_HIGH_WATER = int(os.getenv('SEND_QUEUE_HIGH_WATER', '80'))   # 이 이상이면 리더 읽기 지연
+
+# 전송 스케줄러 (주문 안내 > 헬스 로그 > 서버 점검 순으로 우선)
+SCHEDULER_WORKERS = int(os.getenv('SCHEDULER_WORKERS', '2'))            # 전송 작업 스레드 수 (ORDER_CONCURRENCY보다 커야 함)
+ORDER_CONCURRENCY = int(os.getenv('ORDER_CONCURRENCY', '1'))            # 바코드 동시 전송 수 (1: 순서 보장)
+HEALTH_CONCURRENCY = int(os.getenv('HEALTH_CONCURRENCY', '1'))          # 헬스 로그 동시 전송 수
+DIAGNOSTIC_CONCURRENCY = int(os.getenv('DIAGNOSTIC_CONCURRENCY', '1'))  # 서버 점검 동시 실행 수
+HEALTH_QUEUE_SIZE = 10      # 헬스 로그 최대 대기 건수 (넘으면 오래된 것부터 버림)
+DIAGNOSTIC_QUEUE_SIZE = 2   # 서버 점검 최대 대기 건수
+HEALTH_LOG_TTL = 600        # 10분 - 전송되지 못한 헬스 로그 유효 시간
+SERVER_CHECK_WAIT = 15      # 서버 점검 결과 최대 대기 시간 (초), 넘으면 직전 상태 유지 
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+DID 서버 엔드포인트 목록과 상태(지연 시간, 연속 실패) 추적
+
+DID_SERVERS에 설정한 순서가 우선순위이며, 연속 실패한 엔드포인트는
+ENDPOINT_RETRY_INTERVAL 동안 뒤로 밀려 트래픽이 자동으로 다음 엔드포인트로 넘어갑니다.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+
+from config import (
+    DID_SERVERS, ENDPOINT_FAILURE_THRESHOLD, ENDPOINT_RETRY_INTERVAL,
+    HEDGE_PERCENTILE, HEDGE_MIN_DELAY, HEDGE_MAX_DELAY
+)
+
+
+LATENCY_WINDOW = 100    # 지연 시간 백분위 계산에 사용할 최근 성공 건수
+
+
+class Endpoint:
+    """
+    DID 서버 엔드포인트 하나의 주소와 상태
+    """
+
+    __slots__ = ('base_url', 'api_url', 'health_log_url', 'latencies', 'failures', 'down_until')
+
+    def __init__(self, base_url):
+        """
+        Args:
+            base_url (str): 서버 주소 (예: 'http://192.168.219.110:5173')
+        """
+        self.base_url = base_url
+        self.api_url = f'{base_url}/api/post'
+        self.health_log_url = f'{base_url}/api/health-log'
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.failures = 0
+        self.down_until = None
+
+    def percentile(self, percent):
+        """
+        최근 성공 응답 지연 시간의 백분위 값을 반환합니다.
+
+        Returns:
+            float or None: 지연 시간(초), 기록이 없으면 None
+        """
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, math.ceil(len(ordered) * percent / 100) - 1))
+        return ordered[index]
+
+
+class EndpointPool:
+    """
+    엔드포인트 목록. 여러 전송 스레드에서 동시에 사용합니다.
+    """
+
+    def __init__(self, base_urls, clock=time.monotonic):
+        """
+        Args:
+            base_urls (list): 우선순위 순 서버 주소 목록
+            clock (callable): monotonic 시계 함수
+        """
+        self.endpoints = [Endpoint(url) for url in base_urls]
+        self.clock = clock
+        self.lock = threading.Lock()
+
+    def ordered(self):
+        """
+        시도할 순서대로 엔드포인트를 반환합니다.
+        정상 엔드포인트는 설정 순서대로, 장애 엔드포인트는 재시도 시각이 빠른 순으로 뒤에 둡니다.
+
+        Returns:
+            list: Endpoint 목록
+        """
+        now = self.clock()
+        with self.lock:
+            healthy = [ep for ep in self.endpoints if ep.down_until is None or ep.down_until <= now]
+            down = sorted((ep for ep in self.endpoints if ep not in healthy), key=lambda ep: ep.down_until)
+        return healthy + down
+
+    def record_success(self, endpoint, latency):
+        """성공 응답과 지연 시간을 기록합니다."""
+        with self.lock:
+            endpoint.latencies.append(latency)
+            endpoint.failures = 0
+            endpoint.down_until = None
+
+    def record_failure(self, endpoint):
+        """
+        실패를 기록합니다. 연속 실패가 ENDPOINT_FAILURE_THRESHOLD에 이르면 일정 시간 뒤로 밉니다.
+
+        Returns:
+            bool: 이번 실패로 장애 상태가 되었으면 True
+        """
+        with self.lock:
+            endpoint.failures += 1
+            if endpoint.failures >= ENDPOINT_FAILURE_THRESHOLD:
+                was_up = endpoint.down_until is None
+                endpoint.down_until = self.clock() + ENDPOINT_RETRY_INTERVAL
+                return was_up
+            return False
+
+    def hedge_delay(self, endpoint):
+        """
+        다음 엔드포인트로 같은 요청을 보내기 전 기다릴 시간을 반환합니다.
+        해당 엔드포인트의 HEDGE_PERCENTILE 지연 시간을 HEDGE_MIN_DELAY~HEDGE_MAX_DELAY로 제한한 값입니다.
+
+        Returns:
+            float: 대기 시간(초)
+        """
+        with self.lock:
+            latency = endpoint.percentile(HEDGE_PERCENTILE)
+        if latency is None:
+            return HEDGE_MAX_DELAY
+        return min(HEDGE_MAX_DELAY, max(HEDGE_MIN_DELAY, latency))
+
+    def any_available(self):
+        """장애 상태가 아닌 엔드포인트가 하나라도 있는지 반환합니다."""
+        now = self.clock()
+        with self.lock:
+            return any(ep.down_until is None or ep.down_until <= now for ep in self.endpoints)
+
+
+# 전역 엔드포인트 목록
+endpoint_pool = EndpointPool(DID_SERVERS)
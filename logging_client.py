@@ -8,9 +8,10 @@ import requests
 import json
 import os
 from datetime import datetime
-from logging.handlers import SysLogHandler, RotatingFileHandler
+from logging.handlers import SysLogHandler
 
-from config import SERVER_HOST, API_URL
+from config import SERVER_HOST
+from log_writer import GroupCommitFileHandler
 
 
 class SystemLogger:
@@ -37,9 +38,10 @@ class SystemLogger:
         self.logger = logging.getLogger('barcode-system')
         self.logger.setLevel(logging.DEBUG)  # 디버그 로그 포함
         
-        # 기존 핸들러 제거 (중복 방지)
+        # 기존 핸들러 제거 (중복 방지) - 파일 디스크립터 누수 방지를 위해 닫기까지 수행
         for handler in self.logger.handlers[:]:
             self.logger.removeHandler(handler)
+            handler.close()
         
         # 콘솔 핸들러 추가
         console_handler = logging.StreamHandler()
@@ -72,12 +74,13 @@ class SystemLogger:
     def _setup_file_handlers(self):
         """
         날짜별 로컬 파일 핸들러를 설정합니다.
+        세 파일 모두 그룹 커밋 기록기를 통해 묶음 단위로 기록됩니다. (log_writer 참고)
         """
         today = datetime.now().strftime('%Y-%m-%d')
         
         # 전체 로그 파일 (모든 레벨)
         main_log_file = os.path.join(self.log_dir, f'barcode_system_{today}.log')
-        main_file_handler = RotatingFileHandler(
+        main_file_handler = GroupCommitFileHandler(
             main_log_file, maxBytes=10*1024*1024, backupCount=5, encoding='utf-8'
         )
         main_file_formatter = logging.Formatter(
@@ -90,8 +93,8 @@ class SystemLogger:
         
         # 바코드 전용 로그 파일
         barcode_log_file = os.path.join(self.log_dir, f'barcode_events_{today}.log')
-        self.barcode_file_handler = RotatingFileHandler(
-            barcode_log_file, maxBytes=5*1024*1024, backupCount=3, encoding='utf-8'
+        self.barcode_file_handler = GroupCommitFileHandler(
+            barcode_log_file, maxBytes=5*1024*1024, backupCount=3, encoding='utf-8', durable=True
         )
         barcode_formatter = logging.Formatter(
             '%(asctime)s [%(levelname)s]: %(message)s',
@@ -99,9 +102,17 @@ class SystemLogger:
         )
         self.barcode_file_handler.setFormatter(barcode_formatter)
         
+        # 바코드 이벤트 로거는 이전 인스턴스의 핸들러를 물고 있을 수 있으므로 교체
+        barcode_logger = logging.getLogger('barcode-events')
+        for handler in barcode_logger.handlers[:]:
+            barcode_logger.removeHandler(handler)
+            handler.close()
+        barcode_logger.addHandler(self.barcode_file_handler)
+        barcode_logger.setLevel(logging.INFO)
+        
         # 에러 전용 로그 파일
         error_log_file = os.path.join(self.log_dir, f'errors_{today}.log')
-        error_file_handler = RotatingFileHandler(
+        error_file_handler = GroupCommitFileHandler(
             error_log_file, maxBytes=5*1024*1024, backupCount=3, encoding='utf-8'
         )
         error_file_handler.setFormatter(main_file_formatter)
@@ -177,7 +188,22 @@ class SystemLogger:
         else:
             barcode_logger.error(message)
     
-    def log_system_health(self, serial_status, server_status, barcode_reader_status):
+    def log_barcode_flood(self, suppressed, seconds):
+        """
+        속도 제한으로 버린 스캔의 요약 이벤트를 로깅합니다.
+        
+        Args:
+            suppressed (int): 버린 스캔 수
+            seconds (float): 집계 시간 (초)
+        """
+        message = f"BARCODE_FLOOD_SUPPRESSED: {suppressed} reads in {seconds:.1f}s"
+        self.logger.warning(message)
+        
+        # 바코드 전용 파일에도 기록
+        logging.getLogger('barcode-events').warning(message)
+    
+    def log_system_health(self, serial_status, server_status, barcode_reader_status, scan_flood=False,
+                          upload=True):
         """
         시스템 헬스 상태를 로깅합니다.
         
@@ -185,6 +211,11 @@ class SystemLogger:
             serial_status (bool): 시리얼 포트 상태
             server_status (bool): 서버 연결 상태
             barcode_reader_status (bool): 바코드 리더 상태
+            scan_flood (bool): 스캔 폭주 감지 여부
+            upload (bool): 에러 시 서버 전송 예약 여부 (False면 호출측에서 직접 전송)
+        
+        Returns:
+            tuple: (health_data, errors)
         """
         timestamp = datetime.now().isoformat()
         
@@ -194,7 +225,8 @@ class SystemLogger:
             'hostname': self.hostname,
             'serial_port': 'OK' if serial_status else 'ERROR',
             'server_connection': 'OK' if server_status else 'ERROR',
-            'barcode_reader': 'OK' if barcode_reader_status else 'INACTIVE'
+            'barcode_reader': 'OK' if barcode_reader_status else 'INACTIVE',
+            'scan_rate': 'FLOOD' if scan_flood else 'OK'
         }
         
         # 에러 상태 확인
@@ -205,47 +237,90 @@ class SystemLogger:
             errors.append('SERVER_CONNECTION_ERROR')
         if not barcode_reader_status:
             errors.append('BARCODE_READER_INACTIVE')
+        if scan_flood:
+            errors.append('BARCODE_SCAN_FLOOD')
         
         if errors:
             # 에러가 있으면 에러 로그 전송
             error_message = f"System health errors detected: {', '.join(errors)}"
             self.logger.error(error_message)
-            self._send_error_to_server(health_data, errors)
+            if upload:
+                self._send_error_to_server(health_data, errors)
         else:
             # 모든 상태가 정상이면 정보 로그
             success_message = "System health check: All systems OK"
             self.logger.info(success_message)
+        
+        return health_data, errors
     
     def _send_error_to_server(self, health_data, errors):
         """
-        에러 로그를 REST API로 서버에 전송합니다.
+        에러 로그를 전송 스케줄러의 헬스 등급으로 넘깁니다.
+        바코드 전송이 밀려 있으면 보류되고, 오래되거나 대기열이 넘치면 버려집니다.
         
         Args:
             health_data (dict): 시스템 헬스 데이터
             errors (list): 에러 목록
         """
         try:
-            # 에러 로그 API 엔드포인트 (기본 API_URL 기반)
-            log_api_url = API_URL.replace('/api/post', '/api/health-log')
-            
-            log_payload = {
-                'type': 'health_error',
-                'hostname': self.hostname,
-                'timestamp': health_data['timestamp'],
-                'errors': errors,
-                'status': {
-                    'serial_port': health_data['serial_port'],
-                    'server_connection': health_data['server_connection'],
-                    'barcode_reader': health_data['barcode_reader']
-                }
+            from config import HEALTH_LOG_TTL
+            from scheduler import get_scheduler, PRIORITY_HEALTH
+            get_scheduler().submit(PRIORITY_HEALTH, self._post_error_log, health_data, errors,
+                                   ttl=HEALTH_LOG_TTL)
+        except Exception as e:
+            self.log_error("로그 전송", f"헬스 에러 로그 전송 예약 오류: {e}")
+    
+    def build_health_payload(self, health_data, errors):
+        """
+        헬스 에러 로그 API 요청 본문을 만듭니다.
+        
+        Args:
+            health_data (dict): 시스템 헬스 데이터
+            errors (list): 에러 목록
+        
+        Returns:
+            dict: 요청 본문
+        """
+        return {
+            'type': 'health_error',
+            'hostname': self.hostname,
+            'timestamp': health_data['timestamp'],
+            'errors': errors,
+            'status': {
+                'serial_port': health_data['serial_port'],
+                'server_connection': health_data['server_connection'],
+                'barcode_reader': health_data['barcode_reader'],
+                'scan_rate': health_data['scan_rate']
             }
-            
+        }
+    
+    def record_health_log_response(self, errors, status_code):
+        """
+        헬스 에러 로그 전송 결과를 로깅합니다.
+        
+        Args:
+            errors (list): 전송한 에러 목록
+            status_code (int): HTTP 상태 코드
+        """
+        if status_code == 200:
+            self.log_success(f"헬스 에러 로그 서버 전송 성공: {len(errors)}개 에러")
+        else:
+            self.log_error("로그 전송", f"헬스 에러 로그 전송 실패. 상태 코드: {status_code}")
+    
+    def _post_error_log(self, health_data, errors):
+        """
+        에러 로그를 REST API로 서버에 전송합니다. (현재 우선순위가 가장 높은 DID 서버)
+        
+        Args:
+            health_data (dict): 시스템 헬스 데이터
+            errors (list): 에러 목록
+        """
+        try:
+            from endpoints import endpoint_pool
+            log_payload = self.build_health_payload(health_data, errors)
+            log_api_url = endpoint_pool.ordered()[0].health_log_url
             response = requests.post(log_api_url, json=log_payload, timeout=10)
-            if response.status_code == 200:
-                self.log_success(f"헬스 에러 로그 서버 전송 성공: {len(errors)}개 에러")
-            else:
-                self.log_error("로그 전송", f"헬스 에러 로그 전송 실패. 상태 코드: {response.status_code}")
-                
+            self.record_health_log_response(errors, response.status_code)
         except Exception as e:
             self.log_error("로그 전송", f"헬스 에러 로그 서버 전송 오류: {e}")
     
@@ -3,16 +3,20 @@
 """
 
 import serial
+import threading
 import time
 
-from config import SERIAL_PORT, BAUD_RATE, SERVER_HOST, CHECK_INTERVAL
-from server_client import check_server_connection
+from config import SERIAL_PORT, BAUD_RATE, DID_SERVERS, CHECK_INTERVAL, SERIAL_CAPTURE_FILE, ENABLE_STATUS_API
+from server_client import check_server_connection, start_sender
 from barcode_reader import (
     check_serial_port, read_barcode, open_serial_connection, 
     check_barcode_reader_connection, set_serial_connection,
     initialize_barcode_reader_times, get_barcode_reader_status
 )
 from monitor import start_status_monitor
+from profiler import install_signal_handlers
+from serial_trace import open_capture
+from status_api import start_status_api
 from logging_client import log_info, log_error, log_success
 
 
@@ -22,16 +26,31 @@ def main():
     """
     log_info("바코드 리더 시스템을 시작합니다.")
     log_info(f"시리얼 포트: {SERIAL_PORT}")
-    log_info(f"서버 주소: {SERVER_HOST}")
+    log_info(f"서버 주소: {', '.join(DID_SERVERS)}")
     log_info(f"상태 체크 주기: {CHECK_INTERVAL}초 (5분)")
+    if SERIAL_CAPTURE_FILE:
+        log_info(f"시리얼 원시 데이터 캡처: {SERIAL_CAPTURE_FILE}")
     log_info("바코드 리더 상태 체크: 시리얼 포트 연결 + 바코드 수신 기반")
     
     # 초기 시간 설정
     initialize_barcode_reader_times()
     
+    # 메인 스레드가 바코드 리더 역할 (스택 덤프/프로파일에서 식별용)
+    threading.current_thread().name = 'barcode_reader'
+    
     # 상태 모니터링 스레드 시작
     start_status_monitor()
     
+    # 진단 시그널 핸들러 설치 (스택 덤프, 프로파일러)
+    install_signal_handlers()
+    
+    # 전송 스케줄러 시작 (주문 안내 > 헬스 로그 > 서버 점검)
+    start_sender()
+    
+    # 읽기 전용 상태 API 시작 (관제 시스템 조회용)
+    if ENABLE_STATUS_API:
+        start_status_api()
+    
     # 초기 상태 체크
     if not check_serial_port():
         log_error("초기화", f"시리얼 포트 연결 실패: {SERIAL_PORT}")
@@ -47,7 +66,8 @@ def main():
                 continue
                 
             # 시리얼 포트 열기
-            with serial.Serial(SERIAL_PORT, baudrate=BAUD_RATE, timeout=1) as ser:
+            with open_capture(serial.Serial(SERIAL_PORT, baudrate=BAUD_RATE, timeout=1),
+                              SERIAL_CAPTURE_FILE, SERIAL_PORT, BAUD_RATE) as ser:
                 set_serial_connection(ser)
                 log_success(f"시리얼 포트 {SERIAL_PORT}을(를) {BAUD_RATE} 보드레이트로 열었습니다.")
                 
@@ -8,75 +8,110 @@ from datetime import datetime
 
 from config import CHECK_INTERVAL, SYSLOG_ADDRESS, ENABLE_ERROR_LOG_UPLOAD, LOG_DIRECTORY
 from server_client import check_server_connection, get_server_status
-from barcode_reader import check_serial_port, check_barcode_reader_activity, get_serial_status, get_barcode_reader_status
+from barcode_reader import (
+    check_serial_port, check_barcode_reader_activity, get_serial_status,
+    get_barcode_reader_status, take_scan_flood_alarm
+)
 from logging_client import initialize_logger, get_logger
 from logging_client import log_info, log_error
 
 
+def log_status(serial_status, server_status, barcode_reader_status, scan_flood):
+    """
+    상태 체크 결과를 한 줄로 로깅합니다.
+    
+    Args:
+        serial_status (bool): 시리얼 포트 상태
+        server_status (bool): 서버 연결 상태
+        barcode_reader_status (bool): 바코드 리더 상태
+        scan_flood (bool): 스캔 폭주 감지 여부
+    """
+    status_msg = f"상태 체크 - "
+    status_msg += f"시리얼포트: {'OK' if serial_status else 'ERROR'}, "
+    status_msg += f"서버: {'OK' if server_status else 'ERROR'}, "
+    status_msg += f"바코드리더: {'OK' if barcode_reader_status else 'INACTIVE'}, "
+    status_msg += f"스캔속도: {'FLOOD' if scan_flood else 'OK'}"
+    
+    if serial_status and server_status and barcode_reader_status and not scan_flood:
+        log_info(status_msg)
+    else:
+        log_error("시스템 상태 체크", status_msg)
+
+
+def run_status_check():
+    """
+    시스템 상태를 한 번 확인하고 에러 시 서버로 로그를 전송합니다.
+    """
+    try:
+        # 시스템 상태 체크
+        check_serial_port()
+        check_server_connection() 
+        check_barcode_reader_activity()
+        
+        # 현재 상태 가져오기
+        serial_status = get_serial_status()
+        server_status = get_server_status()
+        barcode_reader_status = get_barcode_reader_status()
+        # 폭주가 상태 체크 주기 사이에 시작/해제되어도 한 번은 보고되도록 알람을 가져와 해제
+        scan_flood = take_scan_flood_alarm()
+        
+        # 상태 로그 출력
+        log_status(serial_status, server_status, barcode_reader_status, scan_flood)
+        
+        # 에러 로그 서버 전송 (설정이 활성화된 경우)
+        if ENABLE_ERROR_LOG_UPLOAD:
+            logger = get_logger()
+            logger.log_system_health(serial_status, server_status, barcode_reader_status, scan_flood)
+        
+    except Exception as e:
+        error_msg = f"상태 모니터링 오류: {e}"
+        log_error("모니터링", error_msg)
+        
+        # 모니터링 자체 오류도 서버로 전송
+        if ENABLE_ERROR_LOG_UPLOAD:
+            try:
+                logger = get_logger()
+                logger.log_custom_error("MONITORING_ERROR", str(e))
+            except Exception as log_e:
+                print(f"로그 전송 오류: {log_e}")
+
+
 def status_monitor():
     """
     5분마다 시스템 상태를 확인하고 에러 시 서버로 로그를 전송합니다.
     """
     while True:
-        try:
-            # 시스템 상태 체크
-            check_serial_port()
-            check_server_connection() 
-            check_barcode_reader_activity()
-            
-            # 현재 상태 가져오기
-            serial_status = get_serial_status()
-            server_status = get_server_status()
-            barcode_reader_status = get_barcode_reader_status()
-            
-            # 상태 로그 출력
-            status_msg = f"상태 체크 - "
-            status_msg += f"시리얼포트: {'OK' if serial_status else 'ERROR'}, "
-            status_msg += f"서버: {'OK' if server_status else 'ERROR'}, "
-            status_msg += f"바코드리더: {'OK' if barcode_reader_status else 'INACTIVE'}"
-            
-            if serial_status and server_status and barcode_reader_status:
-                log_info(status_msg)
-            else:
-                log_error("시스템 상태 체크", status_msg)
-            
-            # 에러 로그 서버 전송 (설정이 활성화된 경우)
-            if ENABLE_ERROR_LOG_UPLOAD:
-                logger = get_logger()
-                logger.log_system_health(serial_status, server_status, barcode_reader_status)
-            
-        except Exception as e:
-            error_msg = f"상태 모니터링 오류: {e}"
-            log_error("모니터링", error_msg)
-            
-            # 모니터링 자체 오류도 서버로 전송
-            if ENABLE_ERROR_LOG_UPLOAD:
-                try:
-                    logger = get_logger()
-                    logger.log_custom_error("MONITORING_ERROR", str(e))
-                except Exception as log_e:
-                    print(f"로그 전송 오류: {log_e}")
-        
+        run_status_check()
         time.sleep(CHECK_INTERVAL)  # 5분 대기
 
 
-def start_status_monitor():
+def setup_logger():
     """
-    상태 모니터링을 백그라운드 스레드로 시작합니다.
+    설정에 따라 시스템 로거를 초기화합니다.
     
     Returns:
-        threading.Thread: 모니터링 스레드 객체
+        SystemLogger: 로거 인스턴스
     """
-    # 로거 초기화
     if ENABLE_ERROR_LOG_UPLOAD:
-        initialize_logger(SYSLOG_ADDRESS, LOG_DIRECTORY)
+        logger = initialize_logger(SYSLOG_ADDRESS, LOG_DIRECTORY)
         log_info(f"시스템 로거 초기화 완료 (로그 디렉토리: {LOG_DIRECTORY})")
     else:
         # 에러 로그 업로드가 비활성화되어도 로컬 로깅은 활성화
-        initialize_logger(None, LOG_DIRECTORY)
+        logger = initialize_logger(None, LOG_DIRECTORY)
         log_info(f"로컬 로거 초기화 완료 (로그 디렉토리: {LOG_DIRECTORY})")
+    return logger
+
+
+def start_status_monitor():
+    """
+    상태 모니터링을 백그라운드 스레드로 시작합니다.
+    
+    Returns:
+        threading.Thread: 모니터링 스레드 객체
+    """
+    setup_logger()
     
-    monitor_thread = threading.Thread(target=status_monitor, daemon=True)
+    monitor_thread = threading.Thread(target=status_monitor, name='status_monitor', daemon=True)
     monitor_thread.start()
     log_info("상태 모니터링 시작됨")
     return monitor_thread 
\ No newline at end of file
@@ -0,0 +1,177 @@
+"""
+현장 진단용 스택 덤프 및 샘플링 프로파일러 (시그널로 실행)
+
+- SIGUSR1: 모든 스레드의 스택을 로그 디렉토리에 파일로 저장
+- SIGUSR2: 샘플링 프로파일러 시작/중지 토글 (PROFILE_DURATION초 후 자동 종료)
+  결과는 collapsed-stack 형식(flamegraph.pl, speedscope 호환)으로 저장됩니다.
+
+사용 예:
+    kill -USR1 <pid>   # 스택 덤프
+    kill -USR2 <pid>   # 프로파일링 시작 (다시 보내면 즉시 중지 후 저장)
+"""
+
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from datetime import datetime
+
+from config import LOG_DIRECTORY, PROFILE_DURATION, PROFILE_SAMPLE_INTERVAL
+from logging_client import log_info, log_error, log_success
+
+
+# 상태 변수들
+profiler_thread = None
+profiler_stop_event = None
+profiler_lock = threading.Lock()
+
+
+def _thread_names():
+    """스레드 ID → 스레드 이름 매핑을 반환합니다."""
+    return {thread.ident: thread.name for thread in threading.enumerate()}
+
+
+def _output_path(log_dir, prefix, extension):
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return os.path.join(log_dir, f'{prefix}_{timestamp}_{os.getpid()}.{extension}')
+
+
+def dump_thread_stacks(log_dir=LOG_DIRECTORY):
+    """
+    모든 스레드의 현재 스택을 파일로 저장합니다.
+
+    Args:
+        log_dir (str): 저장 디렉토리
+
+    Returns:
+        str or None: 저장된 파일 경로, 실패 시 None
+    """
+    try:
+        os.makedirs(log_dir, exist_ok=True)
+        path = _output_path(log_dir, 'stacks', 'txt')
+        names = _thread_names()
+        current = threading.get_ident()
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"# 스택 덤프 {datetime.now().isoformat()} (pid {os.getpid()})\n")
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == current:
+                    continue  # 덤프 스레드 자신은 제외
+                f.write(f"\n--- Thread {names.get(thread_id, '?')} ({thread_id}) ---\n")
+                f.write(''.join(traceback.format_stack(frame)))
+
+        log_success(f"스레드 스택 덤프 저장: {path}")
+        return path
+    except Exception as e:
+        log_error("스택 덤프", f"저장 실패: {e}")
+        return None
+
+
+def _collapse(frame):
+    """프레임을 루트부터 'file:function' 목록으로 변환합니다."""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    stack.reverse()
+    return ';'.join(stack)
+
+
+def _run_profiler(stop_event, duration, interval, log_dir):
+    """
+    지정된 시간 동안 모든 스레드의 스택을 주기적으로 샘플링합니다.
+    """
+    samples = Counter()
+    own_id = threading.get_ident()
+    deadline = time.monotonic() + duration
+    sample_count = 0
+
+    while not stop_event.is_set() and time.monotonic() < deadline:
+        names = _thread_names()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            samples[f"{names.get(thread_id, thread_id)};{_collapse(frame)}"] += 1
+        sample_count += 1
+        stop_event.wait(interval)
+
+    try:
+        os.makedirs(log_dir, exist_ok=True)
+        path = _output_path(log_dir, 'profile', 'collapsed')
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+        log_success(f"프로파일 저장: {path} (샘플 {sample_count}회)")
+    except Exception as e:
+        log_error("프로파일러", f"저장 실패: {e}")
+
+
+def start_profiler(duration=PROFILE_DURATION, interval=PROFILE_SAMPLE_INTERVAL, log_dir=LOG_DIRECTORY):
+    """
+    샘플링 프로파일러를 백그라운드 스레드로 시작합니다.
+
+    Returns:
+        bool: 새로 시작했으면 True, 이미 실행 중이면 False
+    """
+    global profiler_thread, profiler_stop_event
+
+    with profiler_lock:
+        if profiler_thread is not None and profiler_thread.is_alive():
+            return False
+        profiler_stop_event = threading.Event()
+        profiler_thread = threading.Thread(
+            target=_run_profiler,
+            args=(profiler_stop_event, duration, interval, log_dir),
+            name='sampling_profiler',
+            daemon=True
+        )
+        profiler_thread.start()
+    log_info(f"샘플링 프로파일러 시작: {duration}초, 간격 {interval * 1000:.0f}ms")
+    return True
+
+
+def stop_profiler():
+    """
+    실행 중인 프로파일러를 중지합니다. 결과 파일은 프로파일러 스레드가 저장합니다.
+
+    Returns:
+        bool: 중지 요청을 보냈으면 True
+    """
+    with profiler_lock:
+        if profiler_thread is None or not profiler_thread.is_alive():
+            return False
+        profiler_stop_event.set()
+    log_info("샘플링 프로파일러 중지 요청")
+    return True
+
+
+def _handle_stack_dump_signal(signum, frame):
+    # 시그널 핸들러 안에서는 로깅 락 교착을 피하기 위해 별도 스레드에서 처리
+    threading.Thread(target=dump_thread_stacks, name='stack_dump', daemon=True).start()
+
+
+def _handle_profiler_signal(signum, frame):
+    threading.Thread(target=lambda: stop_profiler() or start_profiler(),
+                     name='profiler_toggle', daemon=True).start()
+
+
+def install_signal_handlers():
+    """
+    진단용 시그널 핸들러를 설치합니다. 메인 스레드에서 호출해야 합니다.
+    SIGUSR1/SIGUSR2가 없는 플랫폼(Windows)에서는 아무것도 하지 않습니다.
+
+    Returns:
+        bool: 설치 여부
+    """
+    if not hasattr(signal, 'SIGUSR1') or not hasattr(signal, 'SIGUSR2'):
+        log_info("진단 시그널 미지원 플랫폼 - 스택 덤프/프로파일러 비활성")
+        return False
+
+    signal.signal(signal.SIGUSR1, _handle_stack_dump_signal)
+    signal.signal(signal.SIGUSR2, _handle_profiler_signal)
+    log_info(f"진단 시그널 설치: SIGUSR1=스택 덤프, SIGUSR2=프로파일러 토글 (pid {os.getpid()})")
+    return True
@@ -0,0 +1,103 @@
+"""
+바코드 스캔 폭주(flood) 방지를 위한 토큰 버킷 속도 제한
+"""
+
+import time
+
+
+class TokenBucket:
+    """
+    토큰 버킷 속도 제한기.
+    초당 rate개씩 토큰이 채워지고 최대 burst개까지 모아둘 수 있습니다.
+    """
+
+    __slots__ = ('rate', 'burst', 'tokens', 'updated', 'clock')
+
+    def __init__(self, rate, burst, clock=time.monotonic):
+        """
+        Args:
+            rate (float): 초당 허용 개수
+            burst (int): 순간 허용 최대 개수
+            clock (callable): monotonic 시계 함수
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.clock = clock
+        self.updated = clock()
+
+    def try_acquire(self):
+        """
+        토큰 하나를 사용합니다.
+
+        Returns:
+            bool: 허용 여부
+        """
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class FloodGuard:
+    """
+    리더 한 대의 스캔 폭주 감지기.
+    토큰 버킷을 넘는 스캔은 버리고 개수만 세었다가 summary_interval마다 요약으로 보고합니다.
+    """
+
+    __slots__ = ('bucket', 'summary_interval', 'suppressed', 'window_start', 'flooding', 'clock')
+
+    def __init__(self, rate, burst, summary_interval, clock=time.monotonic):
+        """
+        Args:
+            rate (float): 초당 허용 스캔 수
+            burst (int): 순간 허용 스캔 수
+            summary_interval (float): 폭주 요약 보고 주기 (초)
+            clock (callable): monotonic 시계 함수
+        """
+        self.bucket = TokenBucket(rate, burst, clock)
+        self.summary_interval = summary_interval
+        self.suppressed = 0
+        self.window_start = None
+        self.flooding = False
+        self.clock = clock
+
+    def allow(self):
+        """
+        스캔 하나를 처리해도 되는지 판단합니다. 거부된 스캔은 요약 집계에 포함됩니다.
+
+        Returns:
+            bool: 처리 허용 여부
+        """
+        if self.bucket.try_acquire():
+            return True
+        if self.suppressed == 0:
+            self.window_start = self.clock()
+        self.suppressed += 1
+        self.flooding = True
+        return False
+
+    def pop_summary(self):
+        """
+        요약 보고 시점이 되었으면 (버린 스캔 수, 집계 시간)을 반환하고 집계를 초기화합니다.
+        집계 구간 동안 버린 스캔이 없었으면 폭주 상태를 해제합니다.
+
+        Returns:
+            tuple or None: (suppressed, seconds), 보고할 것이 없으면 None
+        """
+        if self.suppressed == 0:
+            if self.flooding and self.clock() - self.window_start >= self.summary_interval:
+                self.flooding = False
+            return None
+
+        elapsed = self.clock() - self.window_start
+        if elapsed < self.summary_interval:
+            return None
+
+        summary = (self.suppressed, elapsed)
+        self.suppressed = 0
+        self.window_start = self.clock()
+        return summary
@@ -0,0 +1,198 @@
+"""
+서버로 나가는 요청(바코드 전송, 헬스 로그, 서버 점검)의 우선순위 스케줄러
+
+- PRIORITY_ORDER: 주문 안내(바코드) - 버리지 않음, 대기열이 가득 차면 제출측이 대기
+- PRIORITY_HEALTH: 헬스 에러 로그 업로드
+- PRIORITY_DIAGNOSTIC: 서버 연결 점검
+
+상위 등급에 대기 중인 요청이 있으면 하위 등급은 보류되고,
+하위 등급 대기열이 가득 차거나 유효 시간(ttl)이 지나면 오래된 것부터 버립니다.
+작업 스레드 중 주문 동시 실행 한도만큼은 항상 주문용으로 남겨 두므로,
+오래 걸리는 헬스 로그 / 서버 점검이 작업 스레드를 모두 차지해 주문을 막지 않습니다.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from config import (
+    SCHEDULER_WORKERS, SEND_QUEUE_SIZE,
+    ORDER_CONCURRENCY, HEALTH_CONCURRENCY, DIAGNOSTIC_CONCURRENCY,
+    HEALTH_QUEUE_SIZE, DIAGNOSTIC_QUEUE_SIZE
+)
+from logging_client import log_info, log_debug
+
+
+# 우선순위 등급 (숫자가 작을수록 우선)
+PRIORITY_ORDER = 0
+PRIORITY_HEALTH = 1
+PRIORITY_DIAGNOSTIC = 2
+PRIORITY_NAMES = ('order', 'health', 'diagnostic')
+
+
+class OutboundScheduler:
+    """
+    등급별 대기열과 동시 실행 한도를 가진 작업 스케줄러.
+    작업 결과는 concurrent.futures.Future로 돌려줍니다.
+    """
+
+    def __init__(self, workers, limits, queue_sizes, clock=time.monotonic):
+        """
+        Args:
+            workers (int): 작업 스레드 수
+            limits (tuple): 등급별 동시 실행 한도
+            queue_sizes (tuple): 등급별 최대 대기 건수
+            clock (callable): monotonic 시계 함수
+        """
+        if workers <= limits[PRIORITY_ORDER]:
+            raise ValueError(f"SCHEDULER_WORKERS({workers})는 ORDER_CONCURRENCY({limits[PRIORITY_ORDER]})보다 커야 합니다. "
+                             "(주문용 작업 스레드를 남겨 두고 헬스 로그 / 서버 점검을 실행)")
+        self.workers = workers
+        self.limits = limits
+        self.queue_sizes = queue_sizes
+        self.clock = clock
+        # 하위 등급(헬스 로그, 서버 점검)이 함께 쓸 수 있는 작업 스레드 수
+        self.lower_class_workers = workers - limits[PRIORITY_ORDER]
+        self.queues = [deque() for _ in PRIORITY_NAMES]
+        self.inflight = [0] * len(PRIORITY_NAMES)
+        self.dropped = [0] * len(PRIORITY_NAMES)
+        self.condition = threading.Condition()
+        self.threads = []
+
+    def start(self):
+        """작업 스레드를 시작합니다."""
+        with self.condition:
+            if self.threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f'outbound_{index}', daemon=True)
+                thread.start()
+                self.threads.append(thread)
+        log_info(f"전송 스케줄러 시작됨 (작업 스레드 {self.workers}개, 등급별 한도 {self.limits})")
+
+    def submit(self, priority, func, *args, ttl=None, block=False, **kwargs):
+        """
+        작업을 제출합니다.
+
+        Args:
+            priority (int): 우선순위 등급
+            func (callable): 실행할 함수
+            ttl (float): 유효 시간 (초). 지나도록 실행되지 못하면 버림
+            block (bool): 대기열이 가득 차면 빈 자리가 날 때까지 대기 (False면 가장 오래된 작업을 버림)
+
+        Returns:
+            Future: 작업 결과
+        """
+        future = Future()
+        deadline = self.clock() + ttl if ttl is not None else None
+        evicted = None
+
+        with self.condition:
+            queue = self.queues[priority]
+            size = self.queue_sizes[priority]
+            if len(queue) >= size:
+                if block:
+                    self.condition.wait_for(lambda: len(queue) < size)
+                else:
+                    evicted = queue.popleft()[0]
+                    self.dropped[priority] += 1
+            queue.append((future, func, args, kwargs, deadline))
+            self.condition.notify_all()
+
+        if evicted is not None:
+            evicted.cancel()
+            log_debug(f"전송 대기열 포화로 {PRIORITY_NAMES[priority]} 요청을 버렸습니다.")
+        return future
+
+    def _next_task(self):
+        # 잠금 상태에서 호출. 상위 등급에 대기 작업이 있으면 하위 등급은 보류하고,
+        # 하위 등급은 주문용 작업 스레드를 남겨 둔 범위(lower_class_workers) 안에서만 실행
+        for priority, queue in enumerate(self.queues):
+            if not queue:
+                continue
+            if self.inflight[priority] >= self.limits[priority]:
+                return None
+            if priority != PRIORITY_ORDER and sum(self.inflight[PRIORITY_ORDER + 1:]) >= self.lower_class_workers:
+                return None
+            self.inflight[priority] += 1
+            return priority, queue.popleft()
+        return None
+
+    def _worker(self):
+        while True:
+            with self.condition:
+                priority, (future, func, args, kwargs, deadline) = self.condition.wait_for(self._next_task)
+            try:
+                if deadline is not None and self.clock() > deadline:
+                    future.cancel()
+                    with self.condition:
+                        self.dropped[priority] += 1
+                    log_debug(f"유효 시간이 지난 {PRIORITY_NAMES[priority]} 요청을 버렸습니다.")
+                elif future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(func(*args, **kwargs))
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                with self.condition:
+                    self.inflight[priority] -= 1
+                    self.condition.notify_all()
+
+    def pending(self, priority=None):
+        """
+        대기 + 실행 중인 작업 수를 반환합니다.
+
+        Args:
+            priority (int): 등급 (None이면 전체)
+        """
+        if priority is None:
+            return sum(len(queue) for queue in self.queues) + sum(self.inflight)
+        return len(self.queues[priority]) + self.inflight[priority]
+
+    def queued(self, priority):
+        """등급별 대기(미실행) 작업 수를 반환합니다."""
+        return len(self.queues[priority])
+
+    def wait_until(self, predicate, timeout=None):
+        """
+        작업 상태가 바뀔 때마다 predicate를 확인하며 참이 될 때까지 대기합니다.
+
+        Returns:
+            bool: predicate 결과
+        """
+        with self.condition:
+            return self.condition.wait_for(predicate, timeout)
+
+    def join(self, timeout=None):
+        """
+        모든 작업이 끝날 때까지 대기합니다.
+
+        Returns:
+            bool: 모두 끝났으면 True
+        """
+        return self.wait_until(lambda: self.pending() == 0, timeout)
+
+
+# 전역 스케줄러 인스턴스
+outbound_scheduler = None
+scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """
+    전역 전송 스케줄러를 반환합니다. 처음 호출 시 생성하고 시작합니다.
+
+    Returns:
+        OutboundScheduler: 스케줄러 인스턴스
+    """
+    global outbound_scheduler
+    with scheduler_lock:
+        if outbound_scheduler is None:
+            outbound_scheduler = OutboundScheduler(
+                SCHEDULER_WORKERS,
+                (ORDER_CONCURRENCY, HEALTH_CONCURRENCY, DIAGNOSTIC_CONCURRENCY),
+                (SEND_QUEUE_SIZE, HEALTH_QUEUE_SIZE, DIAGNOSTIC_QUEUE_SIZE)
+            )
+            outbound_scheduler.start()
+        return outbound_scheduler
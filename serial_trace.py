@@ -0,0 +1,441 @@
+"""
+시리얼 원시 데이터 캡처 / 재생
+
+캡처: SERIAL_CAPTURE_FILE을 설정하면 리더가 읽은 원시 바이트를 고해상도 시각과 함께
+      바이너리 트레이스 파일에 기록합니다. (디코딩/공백 제거 이전 데이터)
+      파일 이름에 시작 시각을 붙이므로 (logs/scanner.trace → logs/scanner_20240115-103015.trace)
+      재시작해도 이전 트레이스(재시작 원인이 된 장애 기록)를 덮어쓰지 않습니다.
+      캡처는 진단 기능이므로 파일을 열거나 기록할 수 없으면(경로 없음, 디스크 가득 참 등)
+      한 번만 로그를 남기고 캡처 없이 계속 읽습니다.
+재생: 트레이스를 실제 리더 파이프라인(read_barcode)에 원래 속도, N배속, 또는 최대 속도로 다시 넣습니다.
+      속도 제한 등 시간 기반 동작은 트레이스 시각 기준으로 동작하므로 배속과 관계없이 같은 결과를 냅니다.
+      입력이 없는 구간에서는 pyserial과 같이 timeout마다 빈 줄을 반환하므로 폭주 요약 / 해제 시점도 현장과 같습니다.
+      재생 로그는 현장 로그와 섞이지 않도록 임시 디렉토리(또는 --log-dir)에 기록합니다.
+      기본은 바코드 수만 집계하며, 서버로 보내려면 --target(지정 서버) 또는 --send(설정된 DID 서버)를 명시합니다.
+      (현장 트레이스를 그대로 --send로 재생하면 실제 매장 화면에 주문이 다시 안내됩니다)
+
+트레이스 형식 (little endian):
+    헤더:  magic 'BCTR' | version u8 | baud u32 | 시작 시각 time_ns u64 | 포트 이름 길이 u16 | 포트 이름(utf-8)
+    레코드: 시각 오프셋 ns u64 | 종류 u8 (0: 데이터, 1: 포트 열림, 2: 포트 닫힘) | 길이 u16 | 데이터
+
+사용 예:
+    SERIAL_CAPTURE_FILE=logs/scanner.trace python main.py
+    python serial_trace.py dump logs/scanner_20240115-103015.trace
+    python serial_trace.py replay logs/scanner_20240115-103015.trace --speed 10
+    python serial_trace.py replay logs/scanner_20240115-103015.trace --speed 0 --target http://localhost:5173
+"""
+
+import argparse
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+import serial
+
+
+TRACE_MAGIC = b'BCTR'
+TRACE_VERSION = 1
+HEADER = struct.Struct('<4sBIQH')
+RECORD = struct.Struct('<QBH')
+
+RECORD_DATA = 0
+RECORD_OPEN = 1
+RECORD_CLOSE = 2
+MAX_CHUNK = 0xFFFF
+
+# 경로별 트레이스 기록기 (재연결 시에도 같은 파일에 이어서 기록, 열 수 없었던 경로는 None)
+trace_writers = {}
+
+
+def capture_path(path, started=None):
+    """
+    설정된 캡처 경로에 시작 시각을 붙인 실제 트레이스 파일 경로를 반환합니다.
+
+    Args:
+        path (str): 설정된 캡처 경로 (예: logs/scanner.trace)
+        started (float): 시작 시각 (time.time(), 기본: 현재)
+
+    Returns:
+        str: 트레이스 파일 경로 (예: logs/scanner_20240115-103015.trace)
+    """
+    root, ext = os.path.splitext(path)
+    stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(started if started is not None else time.time()))
+    return f'{root}_{stamp}{ext or ".trace"}'
+
+
+class TraceWriter:
+    """
+    트레이스 파일 기록기. 재연결이 있어도 하나의 파일에 이어서 기록합니다.
+    """
+
+    def __init__(self, path, port, baud_rate, clock=time.perf_counter_ns):
+        """
+        Args:
+            path (str): 트레이스 파일 경로 (새 파일, 이미 있으면 FileExistsError)
+            port (str): 시리얼 포트 이름
+            baud_rate (int): 보드레이트
+            clock (callable): 나노초 단위 monotonic 시계 함수
+        """
+        self.path = path
+        self.file = open(path, 'xb')
+        self.lock = threading.Lock()
+        self.failed = False
+        self.clock = clock
+        self.started = clock()
+        port_name = port.encode('utf-8')
+        try:
+            self.file.write(HEADER.pack(TRACE_MAGIC, TRACE_VERSION, baud_rate, time.time_ns(), len(port_name)))
+            self.file.write(port_name)
+            self.file.flush()
+        except OSError:
+            self.file.close()
+            raise
+
+    def record(self, kind, data=b''):
+        """
+        레코드 하나를 기록합니다. 긴 데이터는 여러 레코드로 나눕니다.
+        기록에 실패하면 한 번만 로그를 남기고 이후 기록을 중단합니다. (읽은 데이터는 그대로 전달)
+        """
+        offset = self.clock() - self.started
+        with self.lock:
+            if self.failed:
+                return
+            try:
+                for start in range(0, max(len(data), 1), MAX_CHUNK):
+                    chunk = data[start:start + MAX_CHUNK]
+                    self.file.write(RECORD.pack(offset, kind, len(chunk)))
+                    self.file.write(chunk)
+                self.file.flush()
+            except OSError as e:
+                self.failed = True
+                _report_capture_error(self.path, e)
+                try:
+                    self.file.close()
+                except OSError:
+                    pass  # 닫으면서 남은 버퍼 기록도 실패할 수 있음
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+class TracingSerial:
+    """
+    시리얼 연결을 감싸 읽은 원시 바이트를 트레이스에 기록합니다.
+    그 밖의 속성(is_open, fileno, in_waiting 등)은 원래 연결로 전달합니다.
+    """
+
+    def __init__(self, connection, writer):
+        self._connection = connection
+        self._writer = writer
+        writer.record(RECORD_OPEN)
+
+    def read(self, size=1):
+        data = self._connection.read(size)
+        if data:
+            self._writer.record(RECORD_DATA, data)
+        return data
+
+    def readline(self, *args, **kwargs):
+        data = self._connection.readline(*args, **kwargs)
+        if data:
+            self._writer.record(RECORD_DATA, data)
+        return data
+
+    def close(self):
+        self._writer.record(RECORD_CLOSE)
+        self._connection.close()
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_trace(path):
+    """
+    트레이스 파일을 읽습니다.
+
+    Returns:
+        tuple: (header dict, [(offset_ns, kind, data), ...])
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    magic, version, baud_rate, started_ns, name_length = HEADER.unpack_from(content, 0)
+    if magic != TRACE_MAGIC or version != TRACE_VERSION:
+        raise ValueError(f"지원하지 않는 트레이스 파일입니다: {path}")
+    position = HEADER.size
+    port = content[position:position + name_length].decode('utf-8')
+    position += name_length
+
+    records = []
+    while position + RECORD.size <= len(content):
+        offset, kind, length = RECORD.unpack_from(content, position)
+        position += RECORD.size
+        data = content[position:position + length]
+        if len(data) < length:
+            break  # 기록 중 종료된 마지막 레코드는 무시
+        position += length
+        records.append((offset, kind, data))
+
+    header = {'port': port, 'baud_rate': baud_rate, 'started_ns': started_ns}
+    return header, records
+
+
+class ReplayFinished(serial.SerialException):
+    """트레이스 재생 종료 (read_barcode가 호출측으로 전달하도록 SerialException 하위 클래스)"""
+
+
+class ReplaySerial:
+    """
+    트레이스를 재생하는 가짜 시리얼 연결.
+    readline()은 pyserial과 같이 개행까지 읽거나, 호출 후 timeout(트레이스 시간 기준)이 지나면
+    그때까지 받은 데이터(없으면 빈 값)를 반환합니다.
+    """
+
+    def __init__(self, records, speed=1.0, timeout=1.0):
+        """
+        Args:
+            records (list): read_trace()의 레코드 목록
+            speed (float): 재생 배속 (0이면 대기 없이 최대 속도)
+            timeout (float): readline timeout (트레이스 시간, 초)
+        """
+        self.records = [(offset / 1e9, data) for offset, kind, data in records if kind == RECORD_DATA]
+        self.speed = speed
+        self.timeout = timeout
+        self.index = 0
+        self.buffer = b''
+        self.trace_time = 0.0
+        self.wall_started = time.perf_counter()
+        self.is_open = True
+
+    def clock(self):
+        """현재 트레이스 시각(초). 리더 상태/속도 제한의 시계로 사용합니다."""
+        return self.trace_time
+
+    def _wait_until(self, trace_time):
+        if self.speed > 0:
+            delay = self.wall_started + trace_time / self.speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        self.trace_time = max(self.trace_time, trace_time)
+
+    def readline(self):
+        deadline = self.trace_time + self.timeout
+        while b'\n' not in self.buffer:
+            if self.index >= len(self.records):
+                if self.buffer:
+                    break
+                self.is_open = False
+                raise ReplayFinished("트레이스 재생 완료")
+            offset, data = self.records[self.index]
+            if offset > deadline:
+                # timeout 동안 종단 문자가 오지 않음 - 지금까지 받은 데이터(없으면 b'') 반환
+                self._wait_until(deadline)
+                break
+            self._wait_until(offset)
+            self.buffer += data
+            self.index += 1
+
+        line, newline, rest = self.buffer.partition(b'\n')
+        self.buffer = rest
+        return line + newline
+
+    def read(self, size=1):
+        if not self.buffer:
+            if self.index >= len(self.records):
+                self.is_open = False
+                raise ReplayFinished("트레이스 재생 완료")
+            offset, data = self.records[self.index]
+            self._wait_until(offset)
+            self.buffer = data
+            self.index += 1
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def close(self):
+        self.is_open = False
+
+
+def _report_capture_error(path, error):
+    """캡처 파일 오류를 로그로 남깁니다. (기록기마다 한 번)"""
+    try:
+        from logging_client import log_error
+        log_error("시리얼 캡처", f"{path} 기록 실패 - 캡처 없이 계속 읽습니다: {error}")
+    except Exception:
+        pass  # 로깅 실패는 무시
+
+
+def _open_writer(path, port, baud_rate):
+    """
+    시작 시각을 붙인 새 트레이스 파일을 엽니다.
+
+    Returns:
+        TraceWriter or None: 기록기 (파일을 열 수 없으면 로그만 남기고 None)
+    """
+    started = time.time()
+    while True:
+        try:
+            writer = TraceWriter(capture_path(path, started), port, baud_rate)
+            break
+        except FileExistsError:
+            started += 1  # 같은 초에 다시 시작한 경우 다음 이름 사용
+        except OSError as e:
+            _report_capture_error(path, e)
+            return None
+    try:
+        from logging_client import log_info
+        log_info(f"시리얼 원시 데이터 캡처 파일: {writer.path}")
+    except Exception:
+        pass  # 로깅 실패는 무시
+    return writer
+
+
+def open_capture(connection, path, port, baud_rate):
+    """
+    캡처가 설정되어 있으면 연결을 TracingSerial로 감쌉니다.
+    기록기는 경로별로 한 번만 만들어 재연결 후에도 같은 파일에 이어서 기록하고,
+    파일 이름에는 시작 시각을 붙여 이전 실행의 트레이스를 덮어쓰지 않습니다.
+    캡처 파일을 열거나 기록할 수 없으면 원래 연결을 그대로 반환합니다. (바코드 읽기는 계속)
+
+    Args:
+        connection: 시리얼 연결 객체
+        path (str): 트레이스 파일 경로 (비어 있으면 캡처하지 않음)
+        port (str): 시리얼 포트 이름
+        baud_rate (int): 보드레이트
+
+    Returns:
+        시리얼 연결 객체 (캡처 시 TracingSerial)
+    """
+    if not path:
+        return connection
+    if path not in trace_writers:
+        trace_writers[path] = _open_writer(path, port, baud_rate)
+    writer = trace_writers[path]
+    if writer is None or writer.failed:
+        return connection
+    return TracingSerial(connection, writer)
+
+
+def replay(path, speed=1.0, send=None):
+    """
+    트레이스를 실제 리더 파이프라인으로 재생합니다.
+
+    Args:
+        path (str): 트레이스 파일 경로
+        speed (float): 재생 배속 (0: 최대 속도)
+        send (callable): 바코드 전송 함수 (기본: 전송하지 않고 stats['barcodes']에 모음)
+
+    Returns:
+        dict: 재생 통계
+    """
+    from barcode_reader import ReaderState, read_barcode, new_flood_guard
+
+    header, records = read_trace(path)
+    barcodes = []
+    send = send or barcodes.append
+    connection = ReplaySerial(records, speed)
+    state = ReaderState(clock=connection.clock)
+    state.update(serial_connection=connection, serial_port_available=True)
+
+    started = time.perf_counter()
+    try:
+        read_barcode(connection, state, new_flood_guard(state), send)
+    except ReplayFinished:
+        pass
+    elapsed = time.perf_counter() - started
+
+    data_bytes = sum(len(data) for _, kind, data in records if kind == RECORD_DATA)
+    return {
+        'port': header['port'],
+        'records': len(records),
+        'bytes': data_bytes,
+        'trace_seconds': records[-1][0] / 1e9 if records else 0.0,
+        'elapsed_seconds': elapsed,
+        'barcodes': barcodes,
+    }
+
+
+def post_to_target(base_url):
+    """
+    재생한 바코드를 지정한 서버(테스트 서버 등)로 보내는 전송 함수를 만듭니다.
+
+    Args:
+        base_url (str): 서버 주소 (예: 'http://localhost:5173')
+
+    Returns:
+        callable: 바코드 전송 함수
+    """
+    import requests
+    api_url = f"{base_url.rstrip('/')}/api/post"
+
+    def send(barcode):
+        response = requests.post(api_url, json={'id': barcode}, timeout=10)
+        print(f"[replay] {barcode} -> {response.status_code}")
+
+    return send
+
+
+def dump(path):
+    """트레이스 내용을 사람이 읽을 수 있는 형태로 출력합니다."""
+    header, records = read_trace(path)
+    print(f"# port={header['port']} baud={header['baud_rate']} "
+          f"started={time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(header['started_ns'] / 1e9))}")
+    names = {RECORD_DATA: 'DATA', RECORD_OPEN: 'OPEN', RECORD_CLOSE: 'CLOSE'}
+    for offset, kind, data in records:
+        print(f"{offset / 1e9:14.6f} {names.get(kind, kind):5} {data!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="시리얼 트레이스 재생 / 확인")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    dump_parser = commands.add_parser('dump', help="트레이스 레코드 출력")
+    dump_parser.add_argument('path')
+
+    replay_parser = commands.add_parser('replay', help="트레이스를 리더 파이프라인으로 재생")
+    replay_parser.add_argument('path')
+    replay_parser.add_argument('--speed', type=float, default=1.0, help="재생 배속 (0: 최대 속도)")
+    replay_parser.add_argument('--log-dir', help="재생 중 로그 저장 디렉토리 (기본: 새 임시 디렉토리)")
+    destination = replay_parser.add_mutually_exclusive_group()
+    destination.add_argument('--target', metavar='URL', help="재생한 바코드를 지정한 서버로 전송 (예: 테스트 서버)")
+    destination.add_argument('--send', action='store_true',
+                             help="설정된 DID 서버(DID_SERVERS)로 전송 - 실제 매장 화면에 안내됨")
+
+    args = parser.parse_args(argv)
+    if args.command == 'dump':
+        dump(args.path)
+        return 0
+
+    # 재생한 바코드 이벤트가 현장 로그(LOG_DIRECTORY)나 syslog에 섞이지 않도록 별도 로거 사용
+    from logging_client import initialize_logger
+    log_dir = args.log_dir or tempfile.mkdtemp(prefix='replay-logs-')
+    initialize_logger(None, log_dir)
+
+    if args.send:
+        from server_client import start_sender, enqueue_barcode
+        from scheduler import get_scheduler
+        start_sender()
+        stats = replay(args.path, args.speed, enqueue_barcode)
+        get_scheduler().join()
+    elif args.target:
+        stats = replay(args.path, args.speed, post_to_target(args.target))
+    else:
+        stats = replay(args.path, args.speed)
+
+    print(f"[replay] port={stats['port']} records={stats['records']} bytes={stats['bytes']} "
+          f"trace={stats['trace_seconds']:.3f}s elapsed={stats['elapsed_seconds']:.3f}s"
+          + ("" if args.send or args.target else f" barcodes={len(stats['barcodes'])}") + f" logs={log_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
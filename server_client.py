@@ -2,95 +2,345 @@
 서버 통신 관련 기능들
 """
 
+import time
+import uuid
 import requests
+from concurrent.futures import CancelledError, TimeoutError, ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
 
-from config import API_URL, SERVER_HOST, WARNING_INTERVAL, ENABLE_ERROR_LOG_UPLOAD
-from logging_client import show_warning_message, log_success, log_error
+from config import (
+    DID_SERVERS, WARNING_INTERVAL, ENABLE_ERROR_LOG_UPLOAD,
+    SEND_QUEUE_HIGH_WATER, SERVER_CHECK_WAIT, ENABLE_HEDGING, ORDER_CONCURRENCY
+)
+from endpoints import endpoint_pool
+from logging_client import show_warning_message, log_success, log_error, log_debug
+from scheduler import get_scheduler, PRIORITY_ORDER, PRIORITY_DIAGNOSTIC
 
 
 # 상태 변수들
 server_available = False
 last_server_warning = None
 
+# hedged 요청용 스레드 풀 (엔드포인트별로 분리)
+# 느린 엔드포인트에 남겨진(응답을 기다리지 않게 된) 요청이 다른 엔드포인트로의 hedged 요청을 막지 않도록
+# 엔드포인트마다 풀을 두고, 동시 전송 수 + 남겨진 요청 1건만큼 작업 스레드를 둡니다.
+hedge_executors = {
+    endpoint.base_url: ThreadPoolExecutor(max_workers=ORDER_CONCURRENCY + 1, thread_name_prefix='hedge')
+    for endpoint in endpoint_pool.endpoints
+}
+
 
 def check_server_connection():
     """
     서버 연결 상태를 확인합니다.
+    점검 요청은 가장 낮은 우선순위로 스케줄러를 거치므로, 바코드 전송이 밀려 있으면
+    보류되며 SERVER_CHECK_WAIT 안에 실행되지 못하면 직전 상태를 그대로 반환합니다.
     
     Returns:
         bool: 서버 연결 가능 여부
     """
+    future = get_scheduler().submit(PRIORITY_DIAGNOSTIC, _probe_server)
+    try:
+        return future.result(timeout=SERVER_CHECK_WAIT)
+    except (CancelledError, TimeoutError):
+        future.cancel()
+        log_debug("서버 점검이 바코드 전송에 밀려 보류됨 - 직전 상태 유지")
+        return server_available
+
+
+def _probe_server():
+    """
+    설정된 모든 DID 서버에 직접 요청을 보내 상태를 기록합니다.
+    
+    Returns:
+        bool: 하나 이상의 서버에 연결 가능한지 여부
+    """
+    available = False
+    for endpoint in endpoint_pool.ordered():
+        started = time.monotonic()
+        try:
+            requests.get(endpoint.base_url, timeout=5)
+            endpoint_pool.record_success(endpoint, time.monotonic() - started)
+            available = True
+        except Exception:
+            record_endpoint_failure(endpoint)
+    return record_server_status(available)
+
+
+def record_endpoint_failure(endpoint):
+    """
+    엔드포인트 실패를 기록하고, 장애로 전환되면 로그를 남깁니다.
+    
+    Args:
+        endpoint (Endpoint): 실패한 엔드포인트
+    """
+    if endpoint_pool.record_failure(endpoint):
+        log_error("서버 전환", f"{endpoint.base_url} 연속 실패 - 다음 서버로 트래픽을 넘깁니다.")
+
+
+def record_server_status(available):
+    """
+    서버 점검 결과를 기록하고, 실패 시 경고 메시지를 표시합니다.
+    
+    Args:
+        available (bool): 서버 연결 가능 여부
+    
+    Returns:
+        bool: 기록한 연결 상태
+    """
     global server_available, last_server_warning
     
-    try:
-        response = requests.get(SERVER_HOST, timeout=5)
-        server_available = True
+    server_available = available
+    if available:
         return True
-    except Exception:
-        server_available = False
-        current_time = datetime.now()
-        
-        # 5분마다 또는 처음 실행시에만 경고 메시지 표시
-        if (last_server_warning is None or 
-            current_time - last_server_warning >= timedelta(seconds=WARNING_INTERVAL)):
-            show_warning_message(
-                "서버 연결 오류", 
-                f"서버 {SERVER_HOST}에 연결할 수 없습니다.\n네트워크 연결 상태를 확인해주세요."
-            )
-            last_server_warning = current_time
-        
-        return False
+    
+    current_time = datetime.now()
+    
+    # 5분마다 또는 처음 실행시에만 경고 메시지 표시
+    if (last_server_warning is None or 
+        current_time - last_server_warning >= timedelta(seconds=WARNING_INTERVAL)):
+        show_warning_message(
+            "서버 연결 오류", 
+            f"서버 {', '.join(DID_SERVERS)}에 연결할 수 없습니다.\n네트워크 연결 상태를 확인해주세요."
+        )
+        last_server_warning = current_time
+    
+    return False
 
 
 def send_to_server(barcode):
     """
     읽은 바코드를 서버에 POST 요청으로 전송합니다.
+    실패하면 다음 DID 서버로 넘어가고, ENABLE_HEDGING이면 응답이 늦을 때 다음 서버로도 동시에 보냅니다.
+    같은 전송의 모든 요청은 Idempotency-Key 헤더를 공유하므로 서버에서 중복을 걸러낼 수 있습니다.
     
     Args:
         barcode (str): 전송할 바코드 데이터
     """
     payload = {'id': barcode}
+    headers = {'Idempotency-Key': uuid.uuid4().hex}
     try:
-        response = requests.post(API_URL, json=payload, timeout=10)
-        if response.status_code == 200:
-            log_success(f"바코드 {barcode} 서버 전송 성공")
-            
-            # 성공 로그를 시스템 로거에도 기록
-            if ENABLE_ERROR_LOG_UPLOAD:
-                try:
-                    from logging_client import get_logger
-                    logger = get_logger()
-                    logger.log_barcode_send_result(barcode, True)
-                    logger.log_barcode_event(barcode, 'success')
-                except Exception:
-                    pass  # 로깅 실패는 무시
-        else:
-            error_msg = f"바코드 {barcode} 전송 실패. 상태 코드: {response.status_code}, 응답: {response.text}"
-            log_error("바코드 전송", error_msg)
-            
-            # 실패 로그를 시스템 로거에도 기록
-            if ENABLE_ERROR_LOG_UPLOAD:
-                try:
-                    from logging_client import get_logger
-                    logger = get_logger()
-                    logger.log_barcode_send_result(barcode, False, f"HTTP {response.status_code}: {response.text}")
-                    logger.log_barcode_event(barcode, 'failed')
-                except Exception:
-                    pass  # 로깅 실패는 무시
+        response = _post_with_failover(payload, headers)
+        record_send_response(barcode, response.status_code, response.text)
     except Exception as e:
-        error_msg = f"서버 전송 오류: {e}"
-        log_error("바코드 전송", error_msg)
+        record_send_error(barcode, e)
+
+
+def _post_to_endpoint(endpoint, payload, headers):
+    """
+    엔드포인트 하나에 바코드를 전송하고 결과를 엔드포인트 상태에 기록합니다.
+    5xx 응답과 연결 오류는 실패로 기록합니다.
+    
+    Returns:
+        requests.Response: 응답
+    """
+    started = time.monotonic()
+    try:
+        response = requests.post(endpoint.api_url, json=payload, headers=headers, timeout=10)
+    except Exception:
+        record_endpoint_failure(endpoint)
+        raise
+    if response.status_code >= 500:
+        record_endpoint_failure(endpoint)
+    else:
+        endpoint_pool.record_success(endpoint, time.monotonic() - started)
+    return response
+
+
+def _post_with_failover(payload, headers):
+    """
+    엔드포인트 우선순위대로 전송을 시도합니다.
+    
+    Returns:
+        requests.Response: 처음 받은 정상(5xx 아님) 응답, 없으면 마지막 응답
+    """
+    candidates = endpoint_pool.ordered()
+    last_response = None
+    last_error = None
+    
+    if not ENABLE_HEDGING or len(candidates) == 1:
+        for endpoint in candidates:
+            try:
+                last_response = _post_to_endpoint(endpoint, payload, headers)
+            except Exception as e:
+                last_error = e
+                continue
+            if last_response.status_code < 500:
+                return last_response
+        if last_response is not None:
+            return last_response
+        raise last_error
+    
+    # hedged 전송: 현재 엔드포인트가 hedge_delay 안에 응답하지 않으면 다음 엔드포인트로도 전송
+    pending = set()
+    try:
+        return _post_hedged(candidates, payload, headers, pending)
+    finally:
+        # 아직 시작하지 못한 시도는 취소 (이미 실행 중인 요청은 timeout까지 해당 엔드포인트 풀에서 끝남)
+        for future in pending:
+            future.cancel()
+
+
+def _submit_attempt(endpoint, payload, headers):
+    """엔드포인트 전용 스레드 풀에 전송 시도를 제출합니다."""
+    return hedge_executors[endpoint.base_url].submit(_post_to_endpoint, endpoint, payload, headers)
+
+
+def _post_hedged(candidates, payload, headers, pending):
+    """
+    hedged 전송을 수행합니다. 끝나지 않은 시도는 pending에 남습니다.
+    
+    Returns:
+        requests.Response: 처음 받은 정상(5xx 아님) 응답, 없으면 마지막 응답
+    """
+    last_response = None
+    last_error = None
+    endpoint = candidates.pop(0)
+    pending.add(_submit_attempt(endpoint, payload, headers))
+    while pending:
+        timeout = endpoint_pool.hedge_delay(endpoint) if candidates else None
+        done = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED).done
+        pending -= done
+        if not done:
+            endpoint = candidates.pop(0)
+            log_debug(f"응답 지연 - {endpoint.base_url}로 hedged 요청 전송")
+            pending.add(_submit_attempt(endpoint, payload, headers))
+            continue
+        for future in done:
+            try:
+                last_response = future.result()
+            except Exception as e:
+                last_error = e
+                continue
+            if last_response.status_code < 500:
+                return last_response
+        if not pending and candidates:
+            endpoint = candidates.pop(0)
+            pending.add(_submit_attempt(endpoint, payload, headers))
+    if last_response is not None:
+        return last_response
+    raise last_error
+
+
+def record_send_response(barcode, status_code, text):
+    """
+    바코드 전송 응답을 로깅합니다.
+    
+    Args:
+        barcode (str): 전송한 바코드 데이터
+        status_code (int): HTTP 상태 코드
+        text (str): 응답 본문
+    
+    Returns:
+        bool: 전송 성공 여부
+    """
+    if status_code == 200:
+        log_success(f"바코드 {barcode} 서버 전송 성공")
         
-        # 예외 로그를 시스템 로거에도 기록
+        # 성공 로그를 시스템 로거에도 기록
         if ENABLE_ERROR_LOG_UPLOAD:
             try:
                 from logging_client import get_logger
                 logger = get_logger()
-                logger.log_barcode_send_result(barcode, False, str(e))
-                logger.log_custom_error("BARCODE_SEND_ERROR", f"{barcode}: {str(e)}")
+                logger.log_barcode_send_result(barcode, True)
+                logger.log_barcode_event(barcode, 'success')
             except Exception:
                 pass  # 로깅 실패는 무시
+        return True
+    
+    error_msg = f"바코드 {barcode} 전송 실패. 상태 코드: {status_code}, 응답: {text}"
+    log_error("바코드 전송", error_msg)
+    
+    # 실패 로그를 시스템 로거에도 기록
+    if ENABLE_ERROR_LOG_UPLOAD:
+        try:
+            from logging_client import get_logger
+            logger = get_logger()
+            logger.log_barcode_send_result(barcode, False, f"HTTP {status_code}: {text}")
+            logger.log_barcode_event(barcode, 'failed')
+        except Exception:
+            pass  # 로깅 실패는 무시
+    return False
+
+
+def record_send_error(barcode, error):
+    """
+    바코드 전송 중 발생한 예외를 로깅합니다.
+    
+    Args:
+        barcode (str): 전송한 바코드 데이터
+        error (Exception): 발생한 예외
+    """
+    error_msg = f"서버 전송 오류: {error}"
+    log_error("바코드 전송", error_msg)
+    
+    # 예외 로그를 시스템 로거에도 기록
+    if ENABLE_ERROR_LOG_UPLOAD:
+        try:
+            from logging_client import get_logger
+            logger = get_logger()
+            logger.log_barcode_send_result(barcode, False, str(error))
+            logger.log_custom_error("BARCODE_SEND_ERROR", f"{barcode}: {str(error)}")
+        except Exception:
+            pass  # 로깅 실패는 무시
+
+
+def start_sender():
+    """
+    바코드 전송 스케줄러를 시작합니다. 이미 실행 중이면 기존 스케줄러를 반환합니다.
+    
+    Returns:
+        OutboundScheduler: 전송 스케줄러
+    """
+    return get_scheduler()
+
+
+def enqueue_barcode(barcode):
+    """
+    바코드를 최우선 등급으로 전송 대기열에 넣습니다.
+    대기열이 가득 차 있으면 빈 자리가 날 때까지 대기합니다.
+    
+    Args:
+        barcode (str): 전송할 바코드 데이터
+    
+    Returns:
+        Future: 전송 작업
+    """
+    return get_scheduler().submit(PRIORITY_ORDER, send_to_server, barcode, block=True)
+
+
+def is_send_queue_saturated():
+    """
+    바코드 전송 대기열이 포화(SEND_QUEUE_HIGH_WATER 이상) 상태인지 반환합니다.
+    
+    Returns:
+        bool: 포화 여부
+    """
+    return get_scheduler().queued(PRIORITY_ORDER) >= SEND_QUEUE_HIGH_WATER
+
+
+def wait_for_send_capacity(timeout):
+    """
+    바코드 전송 대기열이 포화 수준 아래로 내려갈 때까지 대기합니다.
+    
+    Args:
+        timeout (float): 최대 대기 시간 (초)
+    
+    Returns:
+        bool: 여유가 생겼으면 True, 시간 초과면 False
+    """
+    return get_scheduler().wait_until(lambda: not is_send_queue_saturated(), timeout)
+
+
+def get_pending_count():
+    """
+    전송 대기 또는 진행 중인 바코드 수를 반환합니다.
+    헬스 로그 / 서버 점검은 제외하여 asyncio 모드(AsyncOutbound.pending)와 같은 값을 보고합니다.
+    
+    Returns:
+        int: 대기 건수
+    """
+    return get_scheduler().pending(PRIORITY_ORDER)
 
 
 def get_server_status():
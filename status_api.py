@@ -0,0 +1,185 @@
+"""
+읽기 전용 로컬 상태 HTTP API
+
+관제 시스템이 여러 장비를 주기적으로 조회할 수 있도록 현재 상태를 JSON으로 제공합니다.
+응답은 메모리에 있는 상태 값으로만 만들며 (파일/네트워크 I/O 없음), 상태 값이 바뀔 때만
+본문과 ETag를 다시 만듭니다. If-None-Match가 현재 ETag와 같으면 본문 없이 304로 응답합니다.
+
+사용 예:
+    curl -i http://<장비>:8765/status
+    curl -i -H 'If-None-Match: "<etag>"' http://<장비>:8765/status
+"""
+
+import hashlib
+import json
+import socket
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+from config import APP_VERSION, STATUS_API_HOST, STATUS_API_PORT
+from barcode_reader import reader_state
+from server_client import get_server_status, get_pending_count
+from logging_client import log_info, log_error
+
+
+STATUS_PATH = '/status'
+REQUEST_TIMEOUT = 5     # 요청 수신 최대 대기 (초) - 느린 클라이언트가 서버를 붙잡지 않도록
+
+HOSTNAME = socket.gethostname()
+
+
+def collect_status(states=None, pending=get_pending_count):
+    """
+    현재 상태 값을 모읍니다. (메모리 조회만 수행)
+
+    Args:
+        states (list): 리더 상태 목록 (기본: 기본 리더 하나). 여러 개면 모니터와 같은 방식으로 합산
+        pending (callable): 전송 대기 또는 진행 중인 바코드 수 함수 (헬스 로그 / 서버 점검 제외)
+
+    Returns:
+        dict: 상태 값
+    """
+    snapshots = [state.snapshot() for state in (states or [reader_state])]
+    serial_status = all(snapshot.serial_port_available for snapshot in snapshots)
+    barcode_reader_status = all(snapshot.barcode_reader_active for snapshot in snapshots)
+    scan_flood = any(snapshot.scan_flood or snapshot.scan_flood_alarm for snapshot in snapshots)
+    received = [snapshot.last_barcode_at for snapshot in snapshots if snapshot.last_barcode_at is not None]
+
+    return {
+        'hostname': HOSTNAME,
+        'version': APP_VERSION,
+        'serial_port': 'OK' if serial_status else 'ERROR',
+        'server_connection': 'OK' if get_server_status() else 'ERROR',
+        'barcode_reader': 'OK' if barcode_reader_status else 'INACTIVE',
+        'scan_rate': 'FLOOD' if scan_flood else 'OK',
+        'last_barcode_at': max(received).isoformat() if received else None,
+        'pending_outbound': pending()
+    }
+
+
+class StatusCache:
+    """
+    상태 응답 본문과 ETag 캐시. 모은 상태 값이 직전과 같으면 만들어 둔 응답을 그대로 사용합니다.
+    """
+
+    def __init__(self, collect=collect_status):
+        """
+        Args:
+            collect (callable): 상태 값(dict)을 반환하는 함수
+        """
+        self.collect = collect
+        self.lock = threading.Lock()
+        self.status = None
+        self.body = b''
+        self.etag = None
+
+    def get(self):
+        """
+        현재 상태의 응답 본문과 ETag를 반환합니다.
+
+        Returns:
+            tuple: (body bytes, etag str)
+        """
+        status = self.collect()
+        with self.lock:
+            if status != self.status:
+                body = json.dumps(status, ensure_ascii=False, sort_keys=True).encode('utf-8')
+                self.etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+                self.body = body
+                self.status = status
+            return self.body, self.etag
+
+
+def etag_matches(if_none_match, etag):
+    """
+    If-None-Match 헤더 값이 ETag와 일치하는지 확인합니다. (목록, 약한 비교 W/ 지원)
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or candidate.replace('W/', '', 1) == etag:
+            return True
+    return False
+
+
+def build_response(cache, method, path, if_none_match=None):
+    """
+    요청에 대한 응답을 만듭니다. (스레드 서버와 asyncio 서버가 함께 사용)
+
+    Args:
+        cache (StatusCache): 상태 캐시
+        method (str): 요청 메서드
+        path (str): 요청 경로
+        if_none_match (str): If-None-Match 헤더 값
+
+    Returns:
+        tuple: (status code, headers list, body bytes)
+    """
+    if method not in ('GET', 'HEAD'):
+        return 405, [('Allow', 'GET, HEAD'), ('Content-Length', '0')], b''
+    if path.split('?', 1)[0] != STATUS_PATH:
+        return 404, [('Content-Length', '0')], b''
+
+    body, etag = cache.get()
+    headers = [('ETag', etag), ('Cache-Control', 'no-cache')]
+    if etag_matches(if_none_match, etag):
+        return 304, headers, b''
+    headers += [('Content-Type', 'application/json; charset=utf-8'), ('Content-Length', str(len(body)))]
+    return 200, headers, (body if method == 'GET' else b'')
+
+
+class StatusRequestHandler(BaseHTTPRequestHandler):
+    """
+    상태 API 요청 처리기
+    """
+
+    timeout = REQUEST_TIMEOUT
+    cache = None
+
+    def _respond(self):
+        code, headers, body = build_response(self.cache, self.command, self.path,
+                                             self.headers.get('If-None-Match'))
+        self.send_response(code)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond()
+
+    def do_HEAD(self):
+        self._respond()
+
+    def do_POST(self):
+        self._respond()
+
+    def log_message(self, format, *args):
+        pass  # 주기적 조회마다 로그가 쌓이지 않도록 요청 로그는 남기지 않음
+
+
+def start_status_api(cache=None, host=STATUS_API_HOST, port=STATUS_API_PORT):
+    """
+    상태 API 서버를 백그라운드 스레드로 시작합니다.
+
+    Args:
+        cache (StatusCache): 상태 캐시 (기본: 기본 리더 / 전송 스케줄러 기준)
+        host (str): 바인드 주소
+        port (int): 포트
+
+    Returns:
+        HTTPServer or None: 서버 객체 (시작 실패 시 None)
+    """
+    handler = type('StatusHandler', (StatusRequestHandler,), {'cache': cache or StatusCache()})
+    try:
+        server = HTTPServer((host, port), handler)
+    except OSError as e:
+        log_error("상태 API", f"{host}:{port} 열기 실패: {e}")
+        return None
+
+    thread = threading.Thread(target=server.serve_forever, name='status_api', daemon=True)
+    thread.start()
+    log_info(f"상태 API 시작됨: http://{host}:{port}{STATUS_PATH}")
+    return server
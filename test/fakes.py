@@ -0,0 +1,38 @@
+"""
+테스트 공용 가짜 객체 (수동 시계, HTTP 응답, 시리얼 연결)
+"""
+
+
+class ManualClock:
+    """수동으로 진행시키는 monotonic 시계 (진행시키지 않으면 시간이 흐르지 않음)"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeResponse:
+    """requests.Response 대용 객체"""
+
+    def __init__(self, status_code=200, text='OK'):
+        self.status_code = status_code
+        self.text = text
+
+
+class FakeSerial:
+    """readline()이 미리 넣어 둔 데이터를 차례로 반환하는 시리얼 연결 대용 객체"""
+
+    def __init__(self, lines):
+        self.lines = list(lines)
+        self.is_open = True
+
+    def readline(self):
+        return self.lines.pop(0) if self.lines else b''
+
+    def close(self):
+        self.is_open = False
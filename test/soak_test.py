@@ -0,0 +1,445 @@
+"""
+장기 구동(soak) 테스트 하네스
+
+가짜 시계와 가짜 시리얼 장치로 실제 모듈(main, barcode_reader, server_client,
+monitor, logging_client)을 구동하면서 수백만 건의 바코드 스캔, 반복적인 장치 분리,
+서버 장애, 스캔 폭주, 날짜 변경을 시뮬레이션합니다. 주기적으로 메모리 할당 스냅샷과
+RSS / 열린 파일 디스크립터 / 스레드 수 / 살아있는 객체 수를 기록하고, 기준치 대비 허용 범위를
+넘어서 증가하면 실패(종료 코드 1)로 처리합니다.
+
+사용 예:
+    python test/soak_test.py --scans 2000000
+    python test/soak_test.py --scans 50000 --tracemalloc
+"""
+
+import argparse
+import collections
+import gc
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+import serial
+
+import barcode_reader
+import logging_client
+import main
+import monitor
+import scheduler
+import server_client
+from config import CHECK_INTERVAL
+from fakes import FakeResponse
+
+
+class FakeClock:
+    """
+    테스트용 가짜 시계. sleep() 호출은 실제로 대기하지 않고 시간을 전진시킵니다.
+    """
+
+    def __init__(self, start):
+        self.current = start
+        self.start = start
+
+    def now(self):
+        return self.current
+
+    def monotonic(self):
+        return (self.current - self.start).total_seconds()
+
+    def advance(self, seconds):
+        self.current += timedelta(seconds=seconds)
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+
+def make_fake_datetime(clock):
+    """
+    datetime.now()가 가짜 시계를 따르도록 하는 datetime 하위 클래스를 만듭니다.
+    """
+    class FakeDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return clock.now()
+
+    return FakeDateTime
+
+
+class FakeServer:
+    """
+    DID 서버 대용. available이 False이면 연결 오류를 발생시킵니다.
+    """
+
+    def __init__(self):
+        self.available = True
+        self.requests = 0
+
+    def get(self, url, **kwargs):
+        return self._handle()
+
+    def post(self, url, **kwargs):
+        return self._handle()
+
+    def _handle(self):
+        self.requests += 1
+        if not self.available:
+            raise requests.ConnectionError("soak: simulated server outage")
+        return FakeResponse()
+
+
+class Metrics:
+    """
+    프로세스 자원 사용량 측정값
+    """
+
+    def __init__(self, scans, rss, fds, threads, objects, traced):
+        self.scans = scans
+        self.rss = rss
+        self.fds = fds
+        self.threads = threads
+        self.objects = objects
+        self.traced = traced
+
+    def __str__(self):
+        rss = f"{self.rss / 1024 / 1024:.1f}MB" if self.rss is not None else "n/a"
+        fds = self.fds if self.fds is not None else "n/a"
+        return (f"scans={self.scans} rss={rss} fds={fds} threads={self.threads} "
+                f"objects={self.objects} traced={self.traced / 1024 / 1024:.1f}MB")
+
+
+def _current_rss():
+    """현재 RSS(byte)를 반환합니다. 측정할 수 없으면 None."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+def _open_fd_count():
+    """열린 파일 디스크립터 수를 반환합니다. 측정할 수 없으면 None."""
+    for fd_dir in ('/proc/self/fd', '/dev/fd'):
+        try:
+            return len(os.listdir(fd_dir))
+        except OSError:
+            continue
+    return None
+
+
+def take_object_snapshot():
+    """
+    GC가 추적하는 객체의 타입별 개수를 반환합니다.
+    tracemalloc보다 정밀도는 낮지만 할당마다 비용이 들지 않아 기본 스냅샷으로 사용합니다.
+    """
+    return collections.Counter(type(obj).__name__ for obj in gc.get_objects())
+
+
+def sample_metrics(scans):
+    gc.collect()
+    traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+    return Metrics(scans, _current_rss(), _open_fd_count(), threading.active_count(),
+                   len(gc.get_objects()), traced)
+
+
+class SoakScenario:
+    """
+    가짜 시리얼 장치가 readline() 때마다 진행시키는 시나리오.
+    스캔, 장치 분리, 서버 장애, 날짜 변경, 상태 체크, 자원 측정을 모두 관리합니다.
+    """
+
+    def __init__(self, args, clock, server):
+        self.args = args
+        self.clock = clock
+        self.server = server
+        self.scans = 0
+        self.unplugged_attempts = 0
+        self.outage_remaining = 0
+        self.disconnects = 0
+        self.outages = 0
+        self.floods = 0
+        self.flood_remaining = 0
+        self.rollovers = 0
+        self.current_day = clock.now().date()
+        self.next_status_check = clock.now() + timedelta(seconds=CHECK_INTERVAL)
+        self.baseline = None
+        self.baseline_snapshot = None
+        self.baseline_objects = None
+        self.samples = []
+
+    def open_device(self):
+        """serial.Serial() 생성자 대용"""
+        if self.unplugged_attempts > 0:
+            self.unplugged_attempts -= 1
+            raise serial.SerialException("soak: simulated device unplugged")
+        return FakeSerialDevice(self)
+
+    def next_line(self):
+        """다음 바코드 한 줄(raw bytes)을 반환하거나 시나리오 이벤트를 발생시킵니다."""
+        args = self.args
+        if self.scans >= args.scans:
+            raise KeyboardInterrupt
+
+        self.scans += 1
+        if self.flood_remaining > 0:
+            # 스캔 폭주 구간: 트리거 고착처럼 1ms 간격으로 연속 입력
+            self.flood_remaining -= 1
+            self.clock.advance(0.001)
+        else:
+            self.clock.advance(args.scan_interval)
+            if args.flood_every and self.scans % args.flood_every == 0:
+                self.floods += 1
+                self.flood_remaining = args.flood_length
+        self._tick()
+
+        if args.disconnect_every and self.scans % args.disconnect_every == 0:
+            self.disconnects += 1
+            self.unplugged_attempts = args.unplug_attempts
+            raise serial.SerialException("soak: simulated device disconnect")
+
+        # 일정 비율로 같은 바코드를 반복해서 중복 필터 경로도 통과시킴
+        order = self.scans if self.scans % 10 else self.scans - 1
+        return f"ORDER{order % 100000:05d}\r\n".encode('utf-8')
+
+    def _tick(self):
+        args = self.args
+
+        # 서버 장애 구간
+        if self.outage_remaining > 0:
+            self.outage_remaining -= 1
+            if self.outage_remaining == 0:
+                self.server.available = True
+        elif args.outage_every and self.scans % args.outage_every == 0:
+            self.outages += 1
+            self.outage_remaining = args.outage_length
+            self.server.available = False
+
+        # 날짜 변경 시 로거를 다시 초기화 (날짜별 로그 파일 전환)
+        today = self.clock.now().date()
+        if today != self.current_day:
+            self.current_day = today
+            self.rollovers += 1
+            initialize_soak_logger(args.log_dir)
+            prune_old_logs(args.log_dir, today)
+
+        # 상태 모니터링 스레드 대신 가짜 시간 기준으로 동기 호출
+        if self.clock.now() >= self.next_status_check:
+            self.next_status_check = self.clock.now() + timedelta(seconds=CHECK_INTERVAL)
+            monitor.run_status_check()
+
+        if self.scans % args.sample_every == 0:
+            self._sample()
+
+    def _sample(self):
+        metrics = sample_metrics(self.scans)
+        if self.baseline is None and self.scans >= self.args.warmup:
+            self.baseline = metrics
+            self.baseline_objects = take_object_snapshot()
+            if tracemalloc.is_tracing():
+                self.baseline_snapshot = tracemalloc.take_snapshot()
+            print(f"[soak] baseline {metrics}", flush=True)
+        elif self.baseline is not None:
+            self.samples.append(metrics)
+            print(f"[soak] {metrics} disconnects={self.disconnects} "
+                  f"outages={self.outages} rollovers={self.rollovers}", flush=True)
+
+
+class FakeSerialDevice:
+    """
+    serial.Serial 대용 장치. 시나리오에서 데이터를 받아 돌려줍니다.
+    """
+
+    def __init__(self, scenario):
+        self.scenario = scenario
+        self.is_open = True
+
+    def readline(self):
+        return self.scenario.next_line()
+
+    def close(self):
+        self.is_open = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def initialize_soak_logger(log_dir):
+    """
+    실제 initialize_logger를 호출하되 콘솔 출력은 억제합니다.
+    """
+    logger = logging_client.initialize_logger(None, log_dir)
+    for handler in logger.logger.handlers:
+        if type(handler) is logging.StreamHandler:
+            handler.setLevel(logging.CRITICAL + 1)
+    return logger
+
+
+def prune_old_logs(log_dir, today):
+    """
+    오늘 날짜가 아닌 로그 파일을 삭제합니다 (장기 구동 시 디스크 사용량 제한).
+    """
+    stamp = today.strftime('%Y-%m-%d')
+    for name in os.listdir(log_dir):
+        if stamp not in name:
+            try:
+                os.remove(os.path.join(log_dir, name))
+            except OSError:
+                pass
+
+
+def check_bounds(args, baseline, samples):
+    """
+    기준치 대비 증가량이 허용 범위를 넘었는지 확인합니다.
+
+    Returns:
+        list: 위반 항목 메시지 목록
+    """
+    failures = []
+    if not samples:
+        return ["측정 샘플이 없습니다 (--scans / --warmup / --sample-every 확인)"]
+
+    peak_rss = max((m.rss for m in samples if m.rss is not None), default=None)
+    peak_fds = max((m.fds for m in samples if m.fds is not None), default=None)
+    peak_threads = max(m.threads for m in samples)
+    peak_objects = max(m.objects for m in samples)
+    peak_traced = max(m.traced for m in samples)
+    mb = 1024 * 1024
+
+    if baseline.rss is not None and peak_rss is not None:
+        growth = peak_rss - baseline.rss
+        if growth > args.max_rss_growth_mb * mb:
+            failures.append(f"RSS 증가 {growth / mb:.1f}MB > {args.max_rss_growth_mb}MB")
+    if baseline.fds is not None and peak_fds is not None:
+        growth = peak_fds - baseline.fds
+        if growth > args.max_fd_growth:
+            failures.append(f"파일 디스크립터 증가 {growth} > {args.max_fd_growth}")
+    growth = peak_threads - baseline.threads
+    if growth > args.max_thread_growth:
+        failures.append(f"스레드 수 증가 {growth} > {args.max_thread_growth}")
+    growth = peak_objects - baseline.objects
+    if growth > args.max_object_growth:
+        failures.append(f"객체 수 증가 {growth} > {args.max_object_growth}")
+    growth = peak_traced - baseline.traced
+    if tracemalloc.is_tracing() and growth > args.max_traced_growth_mb * mb:
+        failures.append(f"할당 메모리 증가 {growth / mb:.1f}MB > {args.max_traced_growth_mb}MB")
+    return failures
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="바코드 리더 시스템 장기 구동 테스트")
+    parser.add_argument('--scans', type=int, default=1000000, help="시뮬레이션할 총 스캔 수")
+    parser.add_argument('--scan-interval', type=float, default=3.0, help="스캔 간 가짜 시간 간격(초)")
+    parser.add_argument('--disconnect-every', type=int, default=5000, help="N 스캔마다 장치 분리 (0: 비활성)")
+    parser.add_argument('--unplug-attempts', type=int, default=3, help="분리 후 재연결 실패 횟수")
+    parser.add_argument('--outage-every', type=int, default=20000, help="N 스캔마다 서버 장애 (0: 비활성)")
+    parser.add_argument('--outage-length', type=int, default=500, help="서버 장애 지속 스캔 수")
+    parser.add_argument('--flood-every', type=int, default=50000, help="N 스캔마다 스캔 폭주 (0: 비활성)")
+    parser.add_argument('--flood-length', type=int, default=2000, help="스캔 폭주 지속 스캔 수")
+    parser.add_argument('--sample-every', type=int, default=10000, help="자원 측정 주기(스캔 수)")
+    parser.add_argument('--warmup', type=int, default=20000, help="기준치 측정 전 워밍업 스캔 수")
+    parser.add_argument('--max-rss-growth-mb', type=float, default=16.0)
+    parser.add_argument('--max-traced-growth-mb', type=float, default=4.0)
+    parser.add_argument('--max-fd-growth', type=int, default=0)
+    parser.add_argument('--max-thread-growth', type=int, default=0)
+    parser.add_argument('--max-object-growth', type=int, default=2000)
+    parser.add_argument('--tracemalloc', action='store_true', help="tracemalloc 할당 추적 활성화 (10배 이상 느림)")
+    parser.add_argument('--log-dir', default=None, help="로그 디렉토리 (기본: 임시 디렉토리)")
+    return parser.parse_args(argv)
+
+
+def run(args):
+    """
+    soak 테스트를 실행합니다.
+
+    Returns:
+        int: 종료 코드 (0: 통과, 1: 실패)
+    """
+    temp_dir = None
+    if args.log_dir is None:
+        temp_dir = tempfile.mkdtemp(prefix='barcode-soak-')
+        args.log_dir = temp_dir
+
+    if args.tracemalloc:
+        tracemalloc.start(10)
+
+    clock = FakeClock(datetime(2024, 1, 1, 9, 0, 0))
+    fake_datetime = make_fake_datetime(clock)
+    server = FakeServer()
+    scenario = SoakScenario(args, clock, server)
+
+    patches = [
+        mock.patch('serial.Serial', lambda *a, **kw: scenario.open_device()),
+        mock.patch('requests.get', server.get),
+        mock.patch('requests.post', server.post),
+        mock.patch('time.sleep', clock.sleep),
+        mock.patch.object(barcode_reader, 'datetime', fake_datetime),
+        mock.patch.object(barcode_reader, 'reader_state', barcode_reader.ReaderState(clock=clock.monotonic)),
+        mock.patch.object(server_client, 'datetime', fake_datetime),
+        mock.patch.object(logging_client, 'datetime', fake_datetime),
+        # 상태 모니터링은 백그라운드 스레드 대신 시나리오에서 동기적으로 호출
+        mock.patch.object(main, 'start_status_monitor', lambda: None),
+        # 하네스 실행 중 외부에 포트를 열지 않음
+        mock.patch.object(main, 'ENABLE_STATUS_API', False),
+    ]
+
+    started = time.perf_counter()
+    try:
+        for patch in patches:
+            patch.start()
+        # main()의 시작 로그부터 임시 로그 디렉토리로 기록 (기본 ./logs에 파일을 남기지 않음)
+        initialize_soak_logger(args.log_dir)
+        main.main()
+        # 남은 전송이 가짜 서버로 끝날 때까지 대기
+        scheduler.get_scheduler().join()
+    finally:
+        for patch in reversed(patches):
+            patch.stop()
+        for logger in (logging_client.get_logger().logger, logging.getLogger('barcode-events')):
+            for handler in logger.handlers[:]:
+                logger.removeHandler(handler)
+                handler.close()
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    elapsed = time.perf_counter() - started
+    print(f"[soak] {scenario.scans} scans in {elapsed:.1f}s "
+          f"({scenario.scans / elapsed:.0f} scans/s), disconnects={scenario.disconnects}, "
+          f"outages={scenario.outages}, floods={scenario.floods}, rollovers={scenario.rollovers}, "
+          f"server_requests={server.requests}")
+
+    failures = check_bounds(args, scenario.baseline, scenario.samples) if scenario.baseline else [
+        "워밍업 이후 측정된 기준치가 없습니다"
+    ]
+    if failures:
+        for failure in failures:
+            print(f"[soak] FAIL: {failure}")
+        if scenario.baseline_snapshot is not None:
+            print("[soak] 할당 증가 상위 항목:")
+            for stat in tracemalloc.take_snapshot().compare_to(scenario.baseline_snapshot, 'traceback')[:10]:
+                print(f"  {stat}")
+        if scenario.baseline_objects is not None:
+            print("[soak] 객체 수 증가 상위 타입:")
+            growth = take_object_snapshot()
+            growth.subtract(scenario.baseline_objects)
+            for name, count in growth.most_common(10):
+                print(f"  {name}: +{count}")
+        return 1
+
+    print("[soak] PASS")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run(parse_args()))
@@ -0,0 +1,289 @@
+"""
+asyncio 실행 모드(async_main) 동작 테스트 (HTTP 클라이언트, 서버 전환, 시리얼 줄 분리 / 읽기 지연, 종료 처리)
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import serial
+
+import async_main
+import barcode_reader
+import logging_client
+from endpoints import EndpointPool
+from async_main import AsyncOutbound, HttpResponse, http_request, deadline_after, _read_lines
+from barcode_reader import ReaderState, new_flood_guard
+
+
+WAIT = 5    # 최대 대기 (초) - 실패 시 테스트가 멈추지 않도록
+
+
+def quiet_logging(test):
+    """로그 파일을 만들지 않도록 로깅 함수 대체"""
+    patchers = [
+        mock.patch.multiple(barcode_reader, show_warning_message=mock.DEFAULT,
+                            log_info=mock.DEFAULT, log_debug=mock.DEFAULT),
+        mock.patch.multiple(async_main, show_warning_message=mock.DEFAULT, log_info=mock.DEFAULT,
+                            log_error=mock.DEFAULT, log_debug=mock.DEFAULT, log_success=mock.DEFAULT),
+        mock.patch.object(logging_client, 'get_logger'),
+    ]
+    for patcher in patchers:
+        patcher.start()
+        test.addCleanup(patcher.stop)
+
+
+async def wait_until(predicate, timeout=WAIT):
+    """predicate가 참이 될 때까지 짧게 반복 확인합니다."""
+    deadline = deadline_after(timeout)
+    while not predicate() and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.01)
+    return predicate()
+
+
+class HttpRequestTest(unittest.IsolatedAsyncioTestCase):
+
+    async def serve(self, response, close=True):
+        """
+        요청을 받으면 response를 보내는 테스트 서버를 시작합니다.
+        close가 False면 응답 후에도 연결을 유지합니다. (본문 길이를 EOF가 아닌 헤더로 판단해야 함)
+        """
+        received = []
+
+        async def handle(reader, writer):
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = [int(line.split(b':')[1]) for line in head.split(b'\r\n')
+                      if line.lower().startswith(b'content-length:')]
+            received.append((head, await reader.readexactly(length[0]) if length else b''))
+            writer.write(response)
+            await writer.drain()
+            if not close:
+                await reader.read()  # 클라이언트가 닫을 때까지 유지
+            writer.close()
+
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        return f'http://127.0.0.1:{server.sockets[0].getsockname()[1]}', received
+
+    async def test_content_length_body(self):
+        url, received = await self.serve(b'HTTP/1.1 201 Created\r\nContent-Length: 5\r\n\r\nhello', close=False)
+        response = await http_request('POST', f'{url}/api/post', {'id': 'ORDER1'}, deadline_after(WAIT),
+                                      {'Idempotency-Key': 'key-1'})
+
+        self.assertEqual(response, HttpResponse(201, 'hello'))
+        head, body = received[0]
+        self.assertTrue(head.startswith(b'POST /api/post HTTP/1.1\r\n'))
+        self.assertIn(b'Idempotency-Key: key-1\r\n', head)
+        self.assertEqual(body, b'{"id": "ORDER1"}')
+
+    async def test_chunked_body(self):
+        url, _ = await self.serve(b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n'
+                                  b'5\r\nhello\r\n6;name=value\r\n world\r\n0\r\n\r\n', close=False)
+        response = await http_request('GET', url, deadline=deadline_after(WAIT))
+        self.assertEqual(response, HttpResponse(200, 'hello world'))
+
+    async def test_body_until_eof(self):
+        url, received = await self.serve(b'HTTP/1.1 503 Service Unavailable\r\n\r\nbusy')
+        response = await http_request('GET', f'{url}/status?verbose=1', deadline=deadline_after(WAIT))
+        self.assertEqual(response, HttpResponse(503, 'busy'))
+        self.assertTrue(received[0][0].startswith(b'GET /status?verbose=1 HTTP/1.1\r\n'))
+
+    async def test_deadline(self):
+        url, _ = await self.serve(b'', close=False)
+        with self.assertRaises(asyncio.TimeoutError):
+            await http_request('GET', url, deadline=deadline_after(0.2))
+
+
+class FailoverTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        quiet_logging(self)
+        self.received = {'primary': 0, 'secondary': 0}
+        primary = await self.serve('primary', respond=False)
+        secondary = await self.serve('secondary', respond=True)
+        patchers = [
+            mock.patch.object(async_main, 'endpoint_pool', EndpointPool([primary, secondary])),
+            mock.patch.object(async_main, 'ENABLE_HEDGING', False),
+            mock.patch.object(async_main, 'SEND_TIMEOUT', 0.3),
+            mock.patch.object(async_main, 'record_endpoint_failure'),
+            mock.patch.object(async_main, 'record_send_response'),
+            mock.patch.object(async_main, 'record_send_error'),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def serve(self, name, respond):
+        async def handle(reader, writer):
+            await reader.readuntil(b'\r\n\r\n')
+            self.received[name] += 1
+            if respond:
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nOK')
+                await writer.drain()
+            await reader.read()  # 응답하지 않는 서버는 클라이언트가 끊을 때까지 대기
+            writer.close()
+
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        return f'http://127.0.0.1:{server.sockets[0].getsockname()[1]}'
+
+    async def test_hanging_primary_fails_over_with_its_own_timeout(self):
+        outbound = AsyncOutbound()
+        worker = outbound.spawn(outbound.run_order_worker())
+        self.addAsyncCleanup(asyncio.gather, worker, return_exceptions=True)
+        self.addCleanup(worker.cancel)
+
+        await outbound.submit_order('ORDER1')
+        # 우선 서버가 제한 시간(0.3초)을 다 써도 다음 서버는 자기 제한 시간으로 전송
+        self.assertTrue(await outbound.wait_for(lambda: outbound.pending() == 0, deadline_after(WAIT)))
+
+        self.assertEqual(self.received, {'primary': 1, 'secondary': 1})
+        async_main.record_send_response.assert_called_once_with('ORDER1', 200, 'OK')
+        async_main.record_send_error.assert_not_called()
+        async_main.record_endpoint_failure.assert_called_once()
+
+
+class ReadLinesTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        quiet_logging(self)
+        master, slave = os.openpty()
+        self.master = master
+        self.connection = serial.Serial(os.ttyname(slave), timeout=0)
+        os.close(slave)
+        self.addCleanup(os.close, master)
+        self.addCleanup(self.connection.close)
+        self.state = ReaderState()
+
+    async def start_reader(self, outbound):
+        task = asyncio.ensure_future(_read_lines(self.connection, self.state, new_flood_guard(self.state), outbound))
+
+        async def stop():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        self.addAsyncCleanup(stop)
+        return task
+
+    def queued(self, outbound):
+        return list(outbound.orders._queue)
+
+    @mock.patch.object(async_main, 'LINE_IDLE_TIMEOUT', 0.2)
+    async def test_split_frames_and_idle_flush(self):
+        outbound = AsyncOutbound()
+        await self.start_reader(outbound)
+
+        # 한 바코드가 여러 번에 나뉘어 도착해도 종단 문자까지 모아 한 줄로 처리
+        os.write(self.master, b'ORD')
+        await asyncio.sleep(0.05)
+        os.write(self.master, b'ER1\r\nORDER2\nORD')
+        await asyncio.sleep(0.05)
+        os.write(self.master, b'ER3')
+        self.assertTrue(await wait_until(lambda: len(self.queued(outbound)) == 2))
+        self.assertEqual(self.queued(outbound), ['ORDER1', 'ORDER2'])
+
+        # 종단 문자 없이 끝난 입력은 LINE_IDLE_TIMEOUT 후 한 줄로 처리
+        self.assertTrue(await wait_until(lambda: len(self.queued(outbound)) == 3))
+        self.assertEqual(self.queued(outbound), ['ORDER1', 'ORDER2', 'ORDER3'])
+
+    async def test_saturated_queue_pauses_reading_until_sent(self):
+        outbound = AsyncOutbound(queue_size=3, high_water=2)
+        await self.start_reader(outbound)
+
+        os.write(self.master, b'ORDER1\nORDER2\n')
+        self.assertTrue(await wait_until(outbound.saturated))
+
+        # 포화 중에는 읽기 알림을 해제하므로 새 데이터는 OS 버퍼에 남음
+        os.write(self.master, b'ORDER3\n')
+        await asyncio.sleep(0.2)
+        self.assertEqual(self.queued(outbound), ['ORDER1', 'ORDER2'])
+        self.assertGreater(self.connection.in_waiting, 0)
+
+        sent = []
+
+        async def post(payload, headers, *args):
+            sent.append(payload['id'])
+            return HttpResponse(200, 'OK')
+
+        with mock.patch.object(async_main, 'post_with_failover', post), \
+                mock.patch.object(async_main, 'record_send_response'):
+            worker = outbound.spawn(outbound.run_order_worker())
+            self.assertTrue(await wait_until(lambda: len(sent) == 3))
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+        self.assertEqual(sent, ['ORDER1', 'ORDER2', 'ORDER3'])
+
+    async def test_full_queue_makes_reader_wait(self):
+        outbound = AsyncOutbound(queue_size=1)
+        await outbound.submit_order('ORDER1')
+        waiting = asyncio.ensure_future(outbound.submit_order('ORDER2'))
+        await asyncio.sleep(0.05)
+        self.assertFalse(waiting.done())
+
+        self.assertEqual(outbound.orders.get_nowait(), 'ORDER1')
+        await asyncio.wait_for(waiting, WAIT)
+        self.assertEqual(self.queued(outbound), ['ORDER2'])
+
+
+class ShutdownTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        quiet_logging(self)
+        self.sent = []
+        patchers = [
+            mock.patch.object(async_main, 'run_reader', self.fake_reader),
+            mock.patch.object(async_main, 'run_monitor', self.fake_monitor),
+            mock.patch.object(async_main, 'record_send_response'),
+            mock.patch.object(async_main, 'ENABLE_STATUS_API', False),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def fake_reader(self, port, state, outbound, stop):
+        # 바코드 세 건을 읽은 직후 종료 요청 (SIGTERM 대신)
+        for barcode in ('ORDER1', 'ORDER2', 'ORDER3'):
+            await outbound.submit_order(barcode)
+        stop.set()
+        await asyncio.Event().wait()  # 취소될 때까지 대기
+
+    async def fake_monitor(self, states, outbound, stop):
+        await stop.wait()
+
+    async def slow_post(self, payload, headers, *args):
+        await asyncio.sleep(0.05)
+        self.sent.append(payload['id'])
+        return HttpResponse(200, 'OK')
+
+    async def hanging_post(self, payload, headers, *args):
+        await asyncio.Event().wait()
+
+    async def test_stop_drains_in_flight_sends(self):
+        with mock.patch.object(async_main, 'post_with_failover', self.slow_post):
+            await asyncio.wait_for(async_main.run(['/dev/fake0']), WAIT)
+
+        self.assertEqual(self.sent, ['ORDER1', 'ORDER2', 'ORDER3'])
+        self.assertEqual(async_main.record_send_response.call_count, 3)
+        async_main.log_error.assert_not_called()
+
+    @mock.patch.object(async_main, 'SHUTDOWN_GRACE', 0.2)
+    async def test_stop_gives_up_after_grace_period(self):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with mock.patch.object(async_main, 'post_with_failover', self.hanging_post):
+            await asyncio.wait_for(async_main.run(['/dev/fake0']), WAIT)
+
+        self.assertLess(loop.time() - started, 1)
+        async_main.log_error.assert_called_once_with("종료", "전송하지 못한 바코드 3건")
+        # 남은 작업(전송 작업 포함)은 모두 취소되어 종료 후 남지 않음
+        self.assertEqual([task for task in asyncio.all_tasks() if task is not asyncio.current_task()], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
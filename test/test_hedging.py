@@ -0,0 +1,80 @@
+"""
+다중 DID 서버 hedged 전송 테스트 (느린 우선 서버)
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import endpoints
+import server_client
+from endpoints import EndpointPool
+from fakes import FakeResponse
+
+
+PRIMARY = 'http://primary.test'
+SECONDARY = 'http://secondary.test'
+SLOW_RESPONSE = 1.5     # 느린 우선 서버 응답 시간 (초)
+HEDGE_DELAY = 0.2       # hedged 요청 대기 (HEDGE_MAX_DELAY)
+
+
+class HedgedSendTest(unittest.TestCase):
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.requests = []
+        pool = EndpointPool([PRIMARY, SECONDARY])
+        executors = {
+            endpoint.base_url: ThreadPoolExecutor(max_workers=2, thread_name_prefix='hedge-test')
+            for endpoint in pool.endpoints
+        }
+        patchers = [
+            mock.patch.object(server_client, 'endpoint_pool', pool),
+            mock.patch.object(server_client, 'hedge_executors', executors),
+            mock.patch.object(server_client, 'ENABLE_HEDGING', True),
+            mock.patch.object(endpoints, 'HEDGE_MAX_DELAY', HEDGE_DELAY),
+            mock.patch.object(server_client, 'log_debug'),
+            mock.patch.object(server_client, 'log_error'),
+            mock.patch('requests.post', self.fake_post),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # 남겨진 느린 요청을 풀어 주고 작업 스레드 정리 (addCleanup은 역순 실행)
+        for executor in executors.values():
+            self.addCleanup(executor.shutdown, wait=True)
+        self.addCleanup(self.release.set)
+
+    def fake_post(self, url, json=None, headers=None, timeout=None):
+        self.requests.append((url, headers['Idempotency-Key']))
+        if url.startswith(PRIMARY):
+            self.release.wait(SLOW_RESPONSE)
+        return FakeResponse()
+
+    def send(self):
+        started = time.monotonic()
+        response = server_client._post_with_failover({'id': 'ORDER1'}, {'Idempotency-Key': str(started)})
+        return response, time.monotonic() - started
+
+    def test_back_to_back_sends_with_slow_primary_are_hedged(self):
+        for _ in range(4):
+            response, elapsed = self.send()
+            self.assertEqual(response.status_code, 200)
+            # 우선 서버의 남겨진 요청과 관계없이 hedge 지연 + 여유 시간 안에 끝나야 함
+            self.assertLess(elapsed, HEDGE_DELAY + 0.5)
+
+    def test_hedged_attempts_share_idempotency_key(self):
+        self.send()
+        keys = {key for url, key in self.requests}
+        self.assertEqual(len(keys), 1)
+        self.assertEqual({url.split('/api')[0] for url, key in self.requests}, {PRIMARY, SECONDARY})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+로컬 로그 그룹 커밋 기록기(log_writer) 동작 테스트
+"""
+
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import log_writer
+from log_writer import GroupCommitWriter, GroupCommitFileHandler
+from fakes import ManualClock
+
+
+class GroupCommitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp(prefix='log-writer-test-')
+        self.addCleanup(shutil.rmtree, self.log_dir, ignore_errors=True)
+
+    def make_writer(self, fsync_policy='never', flush_bytes=1 << 20):
+        # 기록 시점은 테스트에서 flush()로 직접 정함
+        return GroupCommitWriter(60, flush_bytes, fsync_policy, clock=ManualClock())
+
+    def make_logger(self, writer, name, **kwargs):
+        handler = GroupCommitFileHandler(os.path.join(self.log_dir, f'{name}.log'), writer=writer, **kwargs)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger = logging.getLogger(f'log-writer-test.{name}')
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        self.addCleanup(handler.close)
+        return logger, handler
+
+    def read(self, name):
+        with open(os.path.join(self.log_dir, name), encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def test_batch_is_one_write_per_file(self):
+        writer = self.make_writer()
+        main_logger, _ = self.make_logger(writer, 'main')
+        event_logger, _ = self.make_logger(writer, 'events')
+        for index in range(50):
+            main_logger.info(f'main {index}')
+            event_logger.info(f'event {index}')
+
+        self.assertEqual(self.read('main.log'), [])  # flush 전에는 기록하지 않음
+        writer.flush()
+
+        self.assertEqual(writer.stats(), {'batches': 1, 'writes': 2, 'fsyncs': 0})
+        self.assertEqual(self.read('main.log'), [f'main {index}' for index in range(50)])
+        self.assertEqual(self.read('events.log'), [f'event {index}' for index in range(50)])
+
+    def test_rotation_keeps_rotating_file_handler_names(self):
+        writer = self.make_writer()
+        logger, _ = self.make_logger(writer, 'rotate', maxBytes=100, backupCount=2)
+        for index in range(30):
+            logger.info(f'record {index:02d} ' + 'x' * 10)  # 21 bytes/줄 → 파일당 4줄
+        writer.flush()
+
+        self.assertEqual(sorted(os.listdir(self.log_dir)), ['rotate.log', 'rotate.log.1', 'rotate.log.2'])
+        for name in ('rotate.log', 'rotate.log.1', 'rotate.log.2'):
+            self.assertLessEqual(os.path.getsize(os.path.join(self.log_dir, name)), 100)
+        # 최신 기록은 원래 파일, 그 이전은 .1, .2 순
+        self.assertTrue(self.read('rotate.log')[-1].startswith('record 29'))
+        self.assertTrue(self.read('rotate.log.1')[-1].startswith('record 27'))
+        self.assertTrue(self.read('rotate.log.2')[-1].startswith('record 23'))
+
+    def test_fsync_policy_selects_files(self):
+        expected = {'never': 0, 'batch': 2, 'barcode': 1}
+        for policy, fsyncs in expected.items():
+            with self.subTest(policy=policy):
+                writer = self.make_writer(policy)
+                main_logger, _ = self.make_logger(writer, f'{policy}-main')
+                event_logger, events = self.make_logger(writer, f'{policy}-events', durable=True)
+                main_logger.info('main')
+                event_logger.info('event')
+
+                with mock.patch.object(log_writer.os, 'fsync') as fsync:
+                    writer.flush()
+                self.assertEqual(fsync.call_count, fsyncs)
+                self.assertEqual(writer.stats()['fsyncs'], fsyncs)
+                if policy == 'barcode':
+                    fsync.assert_called_once_with(events.stream.fileno())
+
+    def test_byte_threshold_wakes_writer(self):
+        writer = GroupCommitWriter(60, 64, 'never', clock=ManualClock())
+        logger, handler = self.make_logger(writer, 'threshold')
+        logger.info('x' * 100)
+
+        # 시계가 멈춰 있어도 크기 기준을 넘으면 기록 스레드가 바로 기록
+        deadline = time.monotonic() + 5
+        while writer.stats()['batches'] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(writer.stats()['batches'], 1)
+        with writer.io_lock:
+            pass  # 기록 스레드가 파일 쓰기를 마칠 때까지 대기
+        self.assertEqual(self.read('threshold.log'), ['x' * 100])
+
+    def test_record_after_close_does_not_reopen_file(self):
+        writer = self.make_writer()
+        logger, handler = self.make_logger(writer, 'closed')
+        logger.info('before close')
+        handler.close()
+        self.assertIsNone(handler.stream)
+
+        # 다른 스레드가 교체 직전의 핸들러로 늦게 기록하는 경우
+        logger.info('late record')
+        writer.submit(handler, b'already queued\n')
+        writer.flush()
+
+        self.assertIsNone(handler.stream)
+        self.assertEqual(self.read('closed.log'), ['before close'])
+
+    def test_invalid_fsync_policy(self):
+        with self.assertRaises(ValueError):
+            GroupCommitWriter(0.02, 65536, 'always')
+
+
+if __name__ == '__main__':
+    unittest.main()
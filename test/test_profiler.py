@@ -0,0 +1,81 @@
+"""
+현장 진단용 스택 덤프 / 샘플링 프로파일러(profiler) 출력 테스트
+"""
+
+import glob
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import profiler
+from profiler import dump_thread_stacks, _run_profiler
+
+
+# collapsed-stack 한 줄: "스레드;파일:함수;... 샘플수"
+COLLAPSED_LINE = re.compile(r'^[^;]+(;[^;]+)+ \d+$')
+THREAD_NAMES = ('status_monitor', 'barcode_reader')
+
+
+class ProfilerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp(prefix='profiler-test-')
+        self.addCleanup(shutil.rmtree, self.log_dir, ignore_errors=True)
+        patcher = mock.patch.multiple(profiler, log_success=mock.DEFAULT, log_error=mock.DEFAULT)
+        self.logs = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # 실제 프로그램처럼 이름 붙은 스레드가 대기 중인 상태를 만듦
+        release = threading.Event()
+        self.threads = [threading.Thread(target=release.wait, name=name, daemon=True) for name in THREAD_NAMES]
+        for thread in self.threads:
+            thread.start()
+        self.addCleanup(lambda: [thread.join() for thread in self.threads])
+        self.addCleanup(release.set)
+
+    def test_dump_thread_stacks(self):
+        path = dump_thread_stacks(self.log_dir)
+
+        self.assertEqual(os.path.dirname(path), self.log_dir)
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        for thread in self.threads:
+            self.assertIn(f"--- Thread {thread.name} ({thread.ident}) ---", text)
+        # 덤프를 호출한 스레드 자신은 제외
+        self.assertNotIn(f"--- Thread {threading.current_thread().name} ", text)
+        self.logs['log_error'].assert_not_called()
+
+    def test_profiler_writes_collapsed_stacks(self):
+        _run_profiler(threading.Event(), duration=0.1, interval=0.01, log_dir=self.log_dir)
+
+        paths = glob.glob(os.path.join(self.log_dir, 'profile_*.collapsed'))
+        self.assertEqual(len(paths), 1)
+        with open(paths[0], encoding='utf-8') as f:
+            lines = f.read().splitlines()
+
+        self.assertTrue(lines)
+        for line in lines:
+            self.assertRegex(line, COLLAPSED_LINE)
+        roots = {line.split(';', 1)[0] for line in lines}
+        self.assertTrue(set(THREAD_NAMES) <= roots, roots)
+        self.logs['log_success'].assert_called_once()
+        self.logs['log_error'].assert_not_called()
+
+    def test_stop_event_ends_profiling_early(self):
+        stop = threading.Event()
+        stop.set()
+        _run_profiler(stop, duration=60, interval=0.01, log_dir=self.log_dir)
+
+        # 샘플이 없어도 빈 결과 파일은 저장됨
+        self.assertEqual(len(glob.glob(os.path.join(self.log_dir, 'profile_*.collapsed'))), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+스캔 폭주 방지(토큰 버킷 / FloodGuard)와 폭주 헬스 알람 동작 테스트
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import barcode_reader
+import logging_client
+from barcode_reader import ReaderState, handle_barcode_line
+from rate_limiter import TokenBucket, FloodGuard
+from fakes import ManualClock
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_burst_then_refill_at_rate(self):
+        clock = ManualClock()
+        bucket = TokenBucket(rate=2, burst=3, clock=clock)
+
+        self.assertEqual([bucket.try_acquire() for _ in range(4)], [True, True, True, False])
+
+        clock.advance(0.5)  # 2/s * 0.5s = 토큰 1개
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+
+    def test_refill_is_capped_at_burst(self):
+        clock = ManualClock()
+        bucket = TokenBucket(rate=10, burst=2, clock=clock)
+        bucket.try_acquire()
+        bucket.try_acquire()
+
+        clock.advance(60)
+        self.assertEqual([bucket.try_acquire() for _ in range(3)], [True, True, False])
+
+
+class FloodGuardTest(unittest.TestCase):
+
+    def test_summary_after_interval_then_flooding_clears(self):
+        clock = ManualClock()
+        guard = FloodGuard(rate=1, burst=1, summary_interval=10, clock=clock)
+
+        self.assertTrue(guard.allow())
+        self.assertEqual([guard.allow() for _ in range(5)], [False] * 5)
+        self.assertTrue(guard.flooding)
+        self.assertIsNone(guard.pop_summary())  # 집계 구간이 아직 끝나지 않음
+
+        clock.advance(10)
+        self.assertEqual(guard.pop_summary(), (5, 10))
+        self.assertTrue(guard.flooding)
+
+        # 다음 집계 구간 동안 버린 스캔이 없으면 폭주 해제
+        clock.advance(10)
+        self.assertIsNone(guard.pop_summary())
+        self.assertFalse(guard.flooding)
+
+
+class ScanFloodAlarmTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = ManualClock()
+        self.state = ReaderState(clock=self.clock)
+        self.guard = FloodGuard(rate=1, burst=1, summary_interval=10, clock=self.clock)
+        self.sent = []
+        patcher = mock.patch.multiple(barcode_reader, show_warning_message=mock.DEFAULT,
+                                      log_info=mock.DEFAULT, log_debug=mock.DEFAULT)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # 바코드 이벤트 로그 파일을 만들지 않도록 로거 대체
+        logger_patcher = mock.patch.object(logging_client, 'get_logger')
+        logger_patcher.start()
+        self.addCleanup(logger_patcher.stop)
+
+    def scan(self, barcode):
+        handle_barcode_line(barcode, self.state, self.guard, self.sent.append)
+
+    def test_short_flood_is_reported_by_next_health_check(self):
+        for index in range(5):
+            self.scan(f'ORDER{index}')
+        self.assertTrue(self.state.snapshot().scan_flood)
+
+        # 폭주가 상태 체크 전에 끝나도 알람은 유지
+        self.clock.advance(30)
+        self.scan('AFTER1')
+        self.clock.advance(30)
+        self.scan('AFTER2')
+        self.assertFalse(self.state.snapshot().scan_flood)
+
+        self.assertTrue(self.state.take_scan_flood_alarm())
+        # 한 번 보고하면 해제
+        self.assertFalse(self.state.take_scan_flood_alarm())
+
+    def test_ongoing_flood_is_reported_every_check(self):
+        for index in range(5):
+            self.scan(f'ORDER{index}')
+        self.assertTrue(self.state.take_scan_flood_alarm())
+        self.assertTrue(self.state.take_scan_flood_alarm())
+
+
+if __name__ == '__main__':
+    unittest.main()
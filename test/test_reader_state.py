@@ -0,0 +1,81 @@
+"""
+리더 상태(ReaderState) 스냅샷 교체 / 경고 간격 / 경과 시간 동작 테스트
+"""
+
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import barcode_reader
+from barcode_reader import ReaderState, check_barcode_reader_activity
+from config import WARNING_INTERVAL
+from fakes import ManualClock, FakeSerial
+
+
+class ReaderStateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = ManualClock(1000.0)
+        self.state = ReaderState(clock=self.clock)
+
+    def test_update_swaps_in_a_new_snapshot(self):
+        before = self.state.snapshot()
+        after = self.state.update(serial_port_available=True, last_sent_barcode='ORDER1')
+
+        # 이미 읽은 스냅샷은 바뀌지 않음 (락 없이 읽어도 일관된 값)
+        self.assertFalse(before.serial_port_available)
+        self.assertIsNone(before.last_sent_barcode)
+        self.assertIs(self.state.snapshot(), after)
+        self.assertEqual((after.serial_port_available, after.last_sent_barcode), (True, 'ORDER1'))
+
+    def test_concurrent_updates_keep_every_field(self):
+        def update(field, count):
+            for index in range(count):
+                self.state.update(**{field: index})
+
+        threads = [threading.Thread(target=update, args=(field, 5000))
+                   for field in ('last_serial_warning', 'last_barcode_warning')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        snapshot = self.state.snapshot()
+        self.assertEqual((snapshot.last_serial_warning, snapshot.last_barcode_warning), (4999, 4999))
+
+    def test_seconds_since_last_barcode_over_a_day(self):
+        self.assertIsNone(self.state.seconds_since_last_barcode())
+
+        self.state.mark_barcode_received()
+        self.clock.advance(86400 + 3600 + 5)
+        # 하루가 넘는 공백도 그대로 계산 (timedelta.seconds처럼 하루 단위로 잘리지 않음)
+        self.assertEqual(self.state.seconds_since_last_barcode(), 90005)
+
+    def test_activity_check_reports_gap_over_a_day(self):
+        self.state.update(serial_connection=FakeSerial([]))
+        self.state.mark_barcode_received()
+        self.clock.advance(90005)
+
+        with mock.patch.object(barcode_reader, 'log_debug') as log_debug:
+            check_barcode_reader_activity(self.state)
+        log_debug.assert_called_with("바코드 리더 연결됨: 마지막 바코드 수신 90005초 전")
+
+    def test_warning_is_rearmed_after_interval(self):
+        self.assertTrue(self.state.warning_due('last_serial_warning'))
+        self.clock.advance(WARNING_INTERVAL - 1)
+        self.assertFalse(self.state.warning_due('last_serial_warning'))
+
+        # 경고 필드는 서로 독립
+        self.assertTrue(self.state.warning_due('last_barcode_warning'))
+
+        self.clock.advance(1)
+        self.assertTrue(self.state.warning_due('last_serial_warning'))
+        self.assertFalse(self.state.warning_due('last_serial_warning'))
+
+
+if __name__ == '__main__':
+    unittest.main()
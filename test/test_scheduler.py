@@ -0,0 +1,149 @@
+"""
+전송 스케줄러(OutboundScheduler) 우선순위 / 보류 / 버림 동작 테스트
+"""
+
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scheduler
+from scheduler import OutboundScheduler, PRIORITY_ORDER, PRIORITY_HEALTH, PRIORITY_DIAGNOSTIC
+from fakes import ManualClock
+
+
+WAIT = 5    # 작업 완료 최대 대기 (초) - 실패 시 테스트가 멈추지 않도록
+
+
+class OutboundSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        # 로그 파일을 만들지 않도록 로깅 함수 대체
+        patcher = mock.patch.multiple(scheduler, log_info=mock.DEFAULT, log_debug=mock.DEFAULT)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.clock = ManualClock()
+        self.executed = []
+
+    def make(self, workers=2, limits=(1, 1, 1), queue_sizes=(10, 10, 10)):
+        return OutboundScheduler(workers, limits, queue_sizes, self.clock)
+
+    def record(self, name):
+        self.executed.append(name)
+        return name
+
+    def test_runs_higher_classes_first(self):
+        outbound = self.make()
+        # 시작 전에 제출해 두면 모든 작업이 대기열에서 순서를 기다림
+        outbound.submit(PRIORITY_DIAGNOSTIC, self.record, 'probe')
+        outbound.submit(PRIORITY_HEALTH, self.record, 'health')
+        outbound.submit(PRIORITY_ORDER, self.record, 'order1')
+        outbound.submit(PRIORITY_ORDER, self.record, 'order2')
+
+        outbound.start()
+        self.assertTrue(outbound.join(WAIT))
+        # 헬스 로그는 order2와 동시에 시작될 수 있으므로 꺼낸 순서만 확인
+        self.assertEqual(self.executed[0], 'order1')
+        self.assertLess(self.executed.index('order2'), self.executed.index('probe'))
+        self.assertLess(self.executed.index('health'), self.executed.index('probe'))
+
+    def test_lower_class_deferred_while_higher_class_is_queued(self):
+        outbound = self.make(workers=2)
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocking_order():
+            started.set()
+            release.wait(WAIT)
+            self.executed.append('order1')
+
+        outbound.start()
+        outbound.submit(PRIORITY_ORDER, blocking_order)
+        self.assertTrue(started.wait(WAIT))
+        outbound.submit(PRIORITY_ORDER, self.record, 'order2')  # 동시 실행 한도(1)로 대기
+        health = outbound.submit(PRIORITY_HEALTH, self.record, 'health')
+
+        # 작업 스레드가 남아 있어도 주문 대기열이 빌 때까지 헬스 로그는 보류
+        self.assertFalse(outbound.wait_until(lambda: health.running() or health.done(), 0.2))
+        self.assertEqual(outbound.queued(PRIORITY_HEALTH), 1)
+
+        release.set()
+        self.assertTrue(outbound.join(WAIT))
+        self.assertEqual(self.executed, ['order1', 'order2', 'health'])
+
+    def test_lower_classes_leave_a_worker_for_orders(self):
+        outbound = self.make()
+        release = threading.Event()
+        health_started = threading.Event()
+        started = []
+
+        def slow(name):
+            started.append(name)
+            health_started.set()
+            release.wait(WAIT)
+            return name
+
+        outbound.start()
+        self.addCleanup(release.set)
+        health = outbound.submit(PRIORITY_HEALTH, slow, 'health')
+        probe = outbound.submit(PRIORITY_DIAGNOSTIC, slow, 'probe')
+        self.assertTrue(health_started.wait(WAIT))
+
+        # 느린 헬스 로그가 실행 중이어도 남겨 둔 작업 스레드에서 주문은 바로 실행
+        order = outbound.submit(PRIORITY_ORDER, self.record, 'order')
+        self.assertEqual(order.result(0.5), 'order')
+        self.assertEqual(started, ['health'])
+        self.assertFalse(probe.running())
+
+        release.set()
+        self.assertTrue(outbound.join(WAIT))
+        self.assertEqual(started, ['health', 'probe'])
+
+    def test_workers_must_exceed_order_concurrency(self):
+        with self.assertRaises(ValueError):
+            self.make(workers=1, limits=(1, 1, 1))
+
+    def test_full_queue_evicts_oldest_without_blocking(self):
+        outbound = self.make(queue_sizes=(10, 2, 10))
+        first = outbound.submit(PRIORITY_HEALTH, self.record, 'health1')
+        outbound.submit(PRIORITY_HEALTH, self.record, 'health2')
+        outbound.submit(PRIORITY_HEALTH, self.record, 'health3')
+
+        self.assertTrue(first.cancelled())
+        self.assertEqual(outbound.dropped[PRIORITY_HEALTH], 1)
+
+        outbound.start()
+        self.assertTrue(outbound.join(WAIT))
+        self.assertEqual(self.executed, ['health2', 'health3'])
+
+    def test_expired_task_is_dropped_not_run(self):
+        outbound = self.make()
+        stale = outbound.submit(PRIORITY_HEALTH, self.record, 'stale', ttl=10)
+        self.clock.advance(11)
+        fresh = outbound.submit(PRIORITY_HEALTH, self.record, 'fresh', ttl=10)
+
+        outbound.start()
+        self.assertTrue(outbound.join(WAIT))
+        self.assertTrue(stale.cancelled())
+        self.assertEqual(fresh.result(WAIT), 'fresh')
+        self.assertEqual(self.executed, ['fresh'])
+        self.assertEqual(outbound.dropped[PRIORITY_HEALTH], 1)
+
+    def test_exception_is_delivered_through_future(self):
+        outbound = self.make()
+        outbound.start()
+
+        def fail():
+            raise ValueError('boom')
+
+        future = outbound.submit(PRIORITY_ORDER, fail)
+        with self.assertRaises(ValueError):
+            future.result(WAIT)
+        self.assertTrue(outbound.join(WAIT))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+"""
+시리얼 원시 데이터 캡처 / 재생(serial_trace) 동작 테스트
+"""
+
+import errno
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import barcode_reader
+import logging_client
+import serial_trace
+from serial_trace import (
+    open_capture, TracingSerial, TraceWriter, read_trace, replay,
+    RECORD_DATA, RECORD_OPEN, RECORD_CLOSE, MAX_CHUNK
+)
+from fakes import ManualClock, FakeSerial
+
+
+def write_trace(path, events, port='/dev/ttyUSB0', baud_rate=9600):
+    """
+    (트레이스 시각 초, 종류, 데이터) 목록으로 트레이스 파일을 만듭니다.
+    """
+    clock = ManualClock(0)
+    writer = TraceWriter(path, port, baud_rate, clock=clock)
+    for seconds, kind, data in events:
+        clock.now = round(seconds * 1e9)
+        writer.record(kind, data)
+    writer.close()
+
+
+class TraceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp(prefix='serial-trace-test-')
+        self.addCleanup(shutil.rmtree, self.log_dir, ignore_errors=True)
+        patchers = [
+            mock.patch.dict(serial_trace.trace_writers, clear=True),
+            mock.patch.object(logging_client, 'log_info'),
+            mock.patch.object(logging_client, 'log_error'),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TraceFormatTest(TraceTestCase):
+
+    def test_round_trip(self):
+        path = os.path.join(self.log_dir, 'scanner.trace')
+        large = bytes(range(256)) * 300     # MAX_CHUNK보다 큰 데이터는 여러 레코드로 나뉨
+        write_trace(path, [
+            (0.0, RECORD_OPEN, b''),
+            (0.5, RECORD_DATA, b'ORD'),
+            (0.500001, RECORD_DATA, b'ER1\r\n'),
+            (2.0, RECORD_DATA, large),
+            (3.0, RECORD_CLOSE, b''),
+        ], port='/dev/ttyACM0', baud_rate=115200)
+
+        header, records = read_trace(path)
+        self.assertEqual((header['port'], header['baud_rate']), ('/dev/ttyACM0', 115200))
+        self.assertEqual(records, [
+            (0, RECORD_OPEN, b''),
+            (500000000, RECORD_DATA, b'ORD'),
+            (500001000, RECORD_DATA, b'ER1\r\n'),
+            (2000000000, RECORD_DATA, large[:MAX_CHUNK]),
+            (2000000000, RECORD_DATA, large[MAX_CHUNK:]),
+            (3000000000, RECORD_CLOSE, b''),
+        ])
+
+    def test_truncated_last_record_is_ignored(self):
+        path = os.path.join(self.log_dir, 'scanner.trace')
+        write_trace(path, [(0.0, RECORD_DATA, b'ORDER1\n'), (1.0, RECORD_DATA, b'ORDER2\n')])
+        with open(path, 'r+b') as f:
+            f.truncate(os.path.getsize(path) - 3)   # 기록 도중 전원이 꺼진 경우
+
+        self.assertEqual(read_trace(path)[1], [(0, RECORD_DATA, b'ORDER1\n')])
+
+
+class ReplayTest(TraceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patchers = [
+            mock.patch.multiple(barcode_reader, show_warning_message=mock.DEFAULT, log_info=mock.DEFAULT,
+                                log_debug=mock.DEFAULT, SCAN_RATE_LIMIT=5, SCAN_RATE_BURST=20,
+                                FLOOD_SUMMARY_INTERVAL=10),
+            mock.patch.object(logging_client, 'get_logger'),
+            # 재생은 전송 스케줄러를 쓰지 않아야 함
+            mock.patch.object(barcode_reader, 'is_send_queue_saturated', side_effect=AssertionError),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.path = os.path.join(self.log_dir, 'scanner.trace')
+
+    def test_speed_zero_and_n_give_the_same_barcodes(self):
+        write_trace(self.path, [
+            (0.0, RECORD_OPEN, b''),
+            (0.1, RECORD_DATA, b'ORD'),
+            (0.15, RECORD_DATA, b'ER1\r\nORDER2\r\n'),
+            (0.5, RECORD_DATA, b'ORDER3\r\n'),
+        ])
+
+        fastest = replay(self.path, speed=0)
+        tenfold = replay(self.path, speed=10)
+
+        self.assertEqual(fastest['barcodes'], ['ORDER1', 'ORDER2', 'ORDER3'])
+        self.assertEqual(tenfold['barcodes'], fastest['barcodes'])
+        self.assertAlmostEqual(fastest['trace_seconds'], 0.5)
+        self.assertLess(fastest['elapsed_seconds'], 0.04)
+        # 10배속: 0.5초 트레이스 → 약 0.05초
+        self.assertGreaterEqual(tenfold['elapsed_seconds'], 0.045)
+        self.assertLess(tenfold['elapsed_seconds'], 0.5)
+
+    def test_idle_gap_produces_timeout_reads_on_trace_time(self):
+        # 순간 허용치(20)를 넘는 스캔 뒤 30초 동안 입력 없음
+        burst = b''.join(f'ORDER{index:02d}\r\n'.encode() for index in range(25))
+        write_trace(self.path, [(0.0, RECORD_DATA, burst), (30.0, RECORD_DATA, b'LAST\r\n')])
+
+        stats = replay(self.path, speed=0)
+
+        self.assertEqual(len(stats['barcodes']), 21)
+        self.assertEqual(stats['barcodes'][-1], 'LAST')
+        # 현장에서처럼 빈 줄(timeout)로 시간이 흘러 요약은 10초, 해제는 LAST 수신 전에 일어남
+        flood = logging_client.get_logger.return_value.log_barcode_flood
+        flood.assert_called_once()
+        suppressed, seconds = flood.call_args.args
+        self.assertEqual(suppressed, 5)
+        self.assertGreaterEqual(seconds, 10)
+        self.assertLess(seconds, 11)
+        messages = [call.args[0] for call in barcode_reader.log_info.call_args_list]
+        self.assertLess(messages.index("바코드 스캔 폭주 해제"), messages.index("받은 바코드: LAST"))
+
+    def test_partial_line_is_returned_after_timeout(self):
+        write_trace(self.path, [(0.0, RECORD_DATA, b'ORDER1'), (5.0, RECORD_DATA, b'ORDER2\n')])
+        self.assertEqual(replay(self.path, speed=0)['barcodes'], ['ORDER1', 'ORDER2'])
+
+
+class CaptureFailureTest(TraceTestCase):
+
+    def test_unwritable_capture_path_returns_raw_connection(self):
+        path = os.path.join(self.log_dir, 'missing', 'scanner.trace')
+        connection = FakeSerial([b'ORDER1\n'])
+
+        # 재연결마다 다시 시도하거나 로그를 반복하지 않음
+        self.assertIs(open_capture(connection, path, '/dev/ttyUSB0', 9600), connection)
+        self.assertIs(open_capture(connection, path, '/dev/ttyUSB0', 9600), connection)
+        logging_client.log_error.assert_called_once()
+        self.assertEqual(connection.readline(), b'ORDER1\n')
+
+    def test_write_failure_keeps_scans_flowing(self):
+        path = os.path.join(self.log_dir, 'scanner.trace')
+        connection = open_capture(FakeSerial([b'ORDER1\n', b'ORDER2\n']), path, '/dev/ttyUSB0', 9600)
+        self.assertIsInstance(connection, TracingSerial)
+        writer = serial_trace.trace_writers[path]
+
+        # SD 카드가 가득 찬 경우
+        full = OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+        with mock.patch.object(writer.file, 'write', side_effect=full):
+            lines = [connection.readline(), connection.readline()]
+
+        self.assertEqual(lines, [b'ORDER1\n', b'ORDER2\n'])
+        self.assertTrue(writer.failed)
+        logging_client.log_error.assert_called_once()
+
+        # 다음 재연결부터는 캡처 없이 원래 연결 사용
+        raw = FakeSerial([])
+        self.assertIs(open_capture(raw, path, '/dev/ttyUSB0', 9600), raw)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+읽기 전용 상태 API(status_api) 응답 / ETag 동작 테스트
+"""
+
+import asyncio
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server_client
+from async_main import AsyncOutbound
+from barcode_reader import ReaderState, initialize_barcode_reader_times
+from scheduler import OutboundScheduler, PRIORITY_ORDER, PRIORITY_HEALTH, PRIORITY_DIAGNOSTIC
+from status_api import StatusCache, collect_status, build_response, STATUS_PATH
+
+
+class StatusApiTest(unittest.TestCase):
+
+    def setUp(self):
+        self.state = ReaderState()
+        self.pending = 0
+        self.cache = StatusCache(lambda: collect_status([self.state], lambda: self.pending))
+
+    def get(self, if_none_match=None, method='GET', path=STATUS_PATH):
+        code, headers, body = build_response(self.cache, method, path, if_none_match)
+        return code, dict(headers), body
+
+    def test_last_barcode_is_null_until_a_real_scan(self):
+        initialize_barcode_reader_times(self.state)
+        code, headers, body = self.get()
+        self.assertEqual(code, 200)
+        self.assertIsNone(json.loads(body)['last_barcode_at'])
+
+        self.state.mark_barcode_received()
+        self.assertIsNotNone(json.loads(self.get()[2])['last_barcode_at'])
+
+    def test_if_none_match_returns_304_until_state_changes(self):
+        code, headers, body = self.get()
+        etag = headers['ETag']
+
+        for candidate in (etag, 'W/' + etag, '"other", ' + etag, '*'):
+            code, headers, body = self.get(candidate)
+            self.assertEqual((code, body), (304, b''))
+            self.assertEqual(headers['ETag'], etag)
+
+        self.pending = 3
+        code, headers, body = self.get(etag)
+        self.assertEqual(code, 200)
+        self.assertNotEqual(headers['ETag'], etag)
+        self.assertEqual(json.loads(body)['pending_outbound'], 3)
+
+    def test_unchanged_state_reuses_cached_body(self):
+        first = self.get()[2]
+        self.assertIs(self.get()[2], first)
+
+    def test_head_and_errors(self):
+        code, headers, body = self.get(method='HEAD')
+        self.assertEqual((code, body), (200, b''))
+        self.assertGreater(int(headers['Content-Length']), 0)
+
+        self.assertEqual(self.get(path='/other')[0], 404)
+        self.assertEqual(self.get(method='POST')[0], 405)
+
+
+class PendingOutboundTest(unittest.TestCase):
+    """pending_outbound는 두 실행 모드 모두 대기 + 전송 중인 바코드 수 (헬스 로그 / 서버 점검 제외)"""
+
+    def test_threaded_mode_counts_orders_only(self):
+        # 시작하지 않은 스케줄러에 넣어 두면 모든 작업이 대기열에 남음
+        outbound = OutboundScheduler(2, (1, 1, 1), (10, 10, 10))
+        for priority in (PRIORITY_ORDER, PRIORITY_ORDER, PRIORITY_HEALTH, PRIORITY_DIAGNOSTIC):
+            outbound.submit(priority, lambda: None)
+
+        with mock.patch.object(server_client, 'get_scheduler', return_value=outbound):
+            self.assertEqual(collect_status([ReaderState()])['pending_outbound'], 2)
+
+    def test_async_mode_counts_queued_and_active_orders(self):
+        async def pending():
+            outbound = AsyncOutbound()
+            await outbound.submit_order('ORDER1')
+            await outbound.submit_order('ORDER2')
+            outbound.active = 1     # 전송 중인 바코드 1건
+            return collect_status([ReaderState()], outbound.pending)['pending_outbound']
+
+        self.assertEqual(asyncio.run(pending()), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()